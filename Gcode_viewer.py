@@ -6,7 +6,8 @@ Brian Wilson (Grump) and AI. Inspired by scorchworks
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-import sys, os
+import sys, os, re, mmap
+import numpy as np
 import matplotlib
 matplotlib.use("qtagg")
 
@@ -14,13 +15,81 @@ from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QPushButton,
     QFileDialog, QLabel, QSplitter, QStatusBar
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 
 # 🔸 unified theme import
 from themes.theme_utils import apply_theme
 
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+# --- optional C float parser (drop-in for float(), accepts bytes) ---
+try:
+    from fastnumbers import float as parse_float
+except ImportError:
+    parse_float = float
+
+
+# ---------- parsing ----------
+# One match per G0/G1 line; each lookahead captures that axis word (or b"").
+MOVE_RE = re.compile(
+    rb"^G[01]"
+    rb"(?=(?:[^\n]*?\sX([-+]?[\d.]+))?)"
+    rb"(?=(?:[^\n]*?\sY([-+]?[\d.]+))?)"
+    rb"(?=(?:[^\n]*?\sZ([-+]?[\d.]+))?)",
+    re.MULTILINE,
+)
+
+
+def parse_moves(data):
+    """Return an (N, 3) float32 XYZ array of G0/G1 moves that carry both X and Y."""
+    rows = MOVE_RE.findall(data)
+    words = [w or b"nan" for row in rows for w in row]
+    pts = np.fromiter(map(parse_float, words), dtype=np.float32, count=len(words)).reshape(-1, 3)
+    pts = pts[~np.isnan(pts[:, 0]) & ~np.isnan(pts[:, 1])]
+    # Moves without Z inherit the previous move's Z (0 before the first one)
+    z = pts[:, 2]
+    last = np.maximum.accumulate(np.where(~np.isnan(z), np.arange(len(z)), -1))
+    pts[:, 2] = np.where(last >= 0, z[np.maximum(last, 0)], 0.0)
+    return pts
+
+
+def decimate_mask(pts, eps):
+    """Keep only the first and last vertex of each run that stays inside one
+    eps-sized grid cell, so every dropped vertex is within a cell of the path."""
+    keep = np.ones(len(pts), dtype=bool)
+    if len(pts) < 3 or eps <= 0:
+        return keep
+    cell = np.floor(pts / eps).astype(np.int64)
+    moved = np.any(cell[1:] != cell[:-1], axis=1)
+    keep[1:-1] = moved[:-1] | moved[1:]
+    return keep
+
+
+def load_moves(filepath):
+    """parse_moves() for a file, cached in a <file>.gcache.npz sidecar."""
+    cache = filepath + ".gcache.npz"
+    st = os.stat(filepath)
+    key = np.array([st.st_mtime_ns, st.st_size], dtype=np.int64)
+    try:
+        with np.load(cache) as c:
+            if np.array_equal(c["meta"], key):
+                return c["pts"]
+    except Exception:
+        pass
+    if st.st_size == 0:
+        pts = parse_moves(b"")
+    else:
+        # Scan the mapped file in place rather than copying it into memory
+        with open(filepath, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pts = parse_moves(mm)
+    try:
+        np.savez(cache, pts=pts, meta=key)
+    except OSError:
+        pass  # read-only media: just skip the cache
+    return pts
 
 
 class GcodeCanvas(FigureCanvas):
@@ -29,10 +98,31 @@ class GcodeCanvas(FigureCanvas):
         self.ax = self.fig.add_subplot(111, projection="3d")
         super().__init__(self.fig)
         self.setParent(parent)
+        # The toolpath is an animated artist: full draws skip it and
+        # _on_draw() caches the background before painting it on top.
+        self._path = None
+        self._bg = None
+        self._draw_pending = False
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.timeout.connect(self.draw)
+        self.mpl_connect("draw_event", self._on_draw)
         self._reset_axes()
 
+    def _on_draw(self, event):
+        if self._path is None:
+            return
+        self._bg = self.copy_from_bbox(self.fig.bbox)
+        self.ax.draw_artist(self._path)
+
+    def resizeEvent(self, event):
+        self._bg = None
+        super().resizeEvent(event)
+
     def _reset_axes(self):
         self.ax.clear()
+        self._path = None
+        self._bg = None
         self.ax.set_xlabel("X")
         self.ax.set_ylabel("Y")
         self.ax.set_zlabel("Z")
@@ -43,33 +133,47 @@ class GcodeCanvas(FigureCanvas):
     def load_gcode(self, filepath):
         if not os.path.isfile(filepath):
             raise FileNotFoundError(filepath)
-        x, y, z = [], [], []
-        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-            for line in f:
-                if line.startswith(("G0", "G1")):
-                    gx = gy = gz = None
-                    for p in line.split():
-                        if p.startswith("X"): gx = float(p[1:])
-                        elif p.startswith("Y"): gy = float(p[1:])
-                        elif p.startswith("Z"): gz = float(p[1:])
-                    if gx is not None and gy is not None:
-                        x.append(gx)
-                        y.append(gy)
-                        z.append(gz if gz is not None else (z[-1] if z else 0))
+        pts = load_moves(filepath)
         self._reset_axes()
-        if x:
-            self.ax.plot(x, y, z, linewidth=0.9)
-            self.ax.auto_scale_xyz([min(x), max(x)], [min(y), max(y)], [min(z), max(z)])
+        if len(pts):
+            keep = decimate_mask(pts, np.ptp(pts, axis=0).max() * 1e-3)
+            kept = pts[keep]
+            segs = np.stack([kept[:-1], kept[1:]], axis=1)
+            self._path = Line3DCollection(segs, colors="C0", linewidths=0.9, animated=True)
+            self.ax.add_collection3d(self._path)
+            lo, hi = pts.min(axis=0), pts.max(axis=0)
+            self.ax.auto_scale_xyz(*zip(lo, hi))
         self.draw()
 
     def zoom(self, factor):
         cur = self.fig.get_size_inches()
         self.fig.set_size_inches(cur * factor, forward=True)
-        self.draw()
+        self._bg = None  # figure size changed: needs a full draw
+        self._schedule_draw()
 
     def rotate(self, de=0, da=0):
         self.ax.view_init(self.ax.elev + de, self.ax.azim + da)
-        self.draw()
+        self._schedule_draw()
+
+    def _schedule_draw(self):
+        # Coalesce bursts of zoom/rotate calls into at most one redraw per frame
+        if not self._draw_pending:
+            self._draw_pending = True
+            QTimer.singleShot(16, self._do_draw)
+
+    def _do_draw(self):
+        self._draw_pending = False
+        if self._bg is None:
+            self.draw()
+            return
+        # Blit just the re-projected toolpath over the cached background; the
+        # panes and ticks catch up in one full draw once rotating stops.
+        self.ax.M = self.ax.get_proj()
+        self._path.do_3d_projection()
+        self.restore_region(self._bg)
+        self.ax.draw_artist(self._path)
+        self.blit(self.fig.bbox)
+        self._settle_timer.start(150)
 
 
 class GcodeViewer(QMainWindow):
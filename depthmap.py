@@ -4,21 +4,82 @@ DepthMap Generator – CNC Suite Edition
 Brian Wilson (Grump) and AI. Inspired by scorchworks
 """
 
-import sys, os
+import sys, os, functools
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import numpy as np
-from PIL import Image, ImageFilter, ImageOps
+from PIL import Image
+from scipy import ndimage
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QPushButton, QFileDialog,
     QVBoxLayout, QSlider, QSplitter, QMessageBox, QProgressBar, QDoubleSpinBox
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt6.QtGui import QImage, QPixmap, QColor
 
 from themes.theme_utils import apply_theme
 
 
+def format_um(n):
+    """Format an integer number of microns as millimetres with 3 decimals."""
+    return b"%s%d.%03d" % (b"-" if n < 0 else b"", abs(n) // 1000, abs(n) % 1000)
+
+
+@functools.lru_cache(maxsize=16)
+def gaussian_kernel(sigma):
+    """1-D Gaussian weights truncated at 4 sigma, as gaussian_filter1d builds them."""
+    r = int(4.0 * sigma + 0.5)
+    x = np.arange(-r, r + 1)
+    k = np.exp(-0.5 * (x / sigma) ** 2)
+    k /= k.sum()
+    k.flags.writeable = False
+    return k
+
+
+PREVIEW_MAX = (1600, 1200)   # largest preview image (w, h); export uses full res
+
+
+def compute_depth(gray, radius, invert):
+    """Turn uint8 gray pixels into a float32 depth map (0..1) and a uint8
+    preview of it decimated to fit within PREVIEW_MAX."""
+    # Normalise (and invert) through a 256-entry table in a single pass;
+    # inverting before the blur is equivalent since the kernel sums to 1.
+    lut = np.linspace(0.0, 1.0, 256, dtype=np.float32)
+    if invert:
+        lut = lut[::-1]
+    arr = lut[gray]
+    if radius > 0:
+        # Separable Gaussian, blurred in place along each axis
+        k = gaussian_kernel(radius)
+        ndimage.correlate1d(arr, k, axis=0, mode="reflect", output=arr)
+        ndimage.correlate1d(arr, k, axis=1, mode="reflect", output=arr)
+    h, w = arr.shape
+    step = max(1, -(-w // PREVIEW_MAX[0]), -(-h // PREVIEW_MAX[1]))
+    small = arr[::step, ::step]
+    preview = np.empty(small.shape, dtype=np.uint8)
+    np.multiply(small, 255, out=preview, casting="unsafe")
+    return arr, preview
+
+
+# ---------- worker ----------
+class DepthSignals(QObject):
+    done = pyqtSignal(int, object, object)
+
+
+class DepthWorker(QRunnable):
+    """Runs compute_depth() on the global thread pool, off the GUI thread."""
+
+    def __init__(self, job, gray, radius, invert):
+        super().__init__()
+        self.signals = DepthSignals()
+        self._job = job
+        self._args = (gray, radius, invert)
+
+    def run(self):
+        arr, preview = compute_depth(*self._args)
+        self.signals.done.emit(self._job, arr, preview)
+
+
 class CNCDepthMapGeneratorQt(QMainWindow):
     def __init__(self, colors):
         super().__init__()
@@ -28,7 +89,16 @@ class CNCDepthMapGeneratorQt(QMainWindow):
         self.loaded_image = None
         self.processed_image = None
         self.depth_array = None
+        self._gray = None        # uint8 source pixels backing loaded_image
+        self._depth_u8 = None    # uint8 depth pixels backing processed_image
+        self._base_pixmap = None  # full-size pixmap of the image being shown
         self.zoom_factor = 1.0
+        self._job = 0            # bumped per load/generate; stale results are dropped
+        # Wheel ticks scale with FastTransformation; one smooth rescale
+        # follows once the wheel has been idle for a moment.
+        self._zoom_timer = QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.timeout.connect(self.update_zoomed_image)
         self.init_ui()
 
     def init_ui(self):
@@ -117,20 +187,19 @@ class CNCDepthMapGeneratorQt(QMainWindow):
         delta = event.angleDelta().y()
         self.zoom_factor *= 1.1 if delta > 0 else 1 / 1.1
         self.zoom_factor = max(0.1, min(self.zoom_factor, 10.0))
-        self.update_zoomed_image()
+        self.update_zoomed_image(smooth=False)
+        self._zoom_timer.start(120)
 
-    def update_zoomed_image(self):
-        if self.processed_image is not None:
-            base = QPixmap.fromImage(self.processed_image)
-        elif self.loaded_image is not None:
-            base = QPixmap.fromImage(self.loaded_image)
-        else:
+    def update_zoomed_image(self, smooth=True):
+        base = self._base_pixmap
+        if base is None:
             return
         w = int(800 * self.zoom_factor)
         h = int(600 * self.zoom_factor)
         scaled = base.scaled(
             w, h, Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
+            Qt.TransformationMode.SmoothTransformation if smooth
+            else Qt.TransformationMode.FastTransformation
         )
         self.image_label.setPixmap(scaled)
 
@@ -141,8 +210,10 @@ class CNCDepthMapGeneratorQt(QMainWindow):
         )
         if not path:
             return
-        img = Image.open(path).convert("L")
-        self.loaded_image = self.pil_to_qimage(img)
+        self._gray = np.ascontiguousarray(Image.open(path).convert("L"))
+        self._job += 1
+        self.loaded_image = self.gray_to_qimage(self._gray)
+        self._base_pixmap = QPixmap.fromImage(self.loaded_image)
         self.processed_image = None
         self.depth_array = None
         self.update_zoomed_image()
@@ -154,19 +225,21 @@ class CNCDepthMapGeneratorQt(QMainWindow):
             return
         self.progress.setValue(10)
         self.statusBar().showMessage("Processing...")
-        QTimer.singleShot(100, self._do_generate)
-
-    def _do_generate(self):
+        self._job += 1
+        worker = DepthWorker(
+            self._job, self._gray, self.blur_slider.value(), self.invert_btn.isChecked()
+        )
+        worker.signals.done.connect(self._on_depth_ready)
+        QThreadPool.globalInstance().start(worker)
         self.progress.setValue(40)
-        img = self.qimage_to_pil(self.loaded_image)
-        if self.blur_slider.value() > 0:
-            img = img.filter(ImageFilter.GaussianBlur(self.blur_slider.value()))
-        if self.invert_btn.isChecked():
-            img = ImageOps.invert(img)
-        arr = np.array(img).astype(np.float32) / 255.0
+
+    def _on_depth_ready(self, job, arr, preview):
+        if job != self._job:
+            return
         self.depth_array = arr
-        depth_img = Image.fromarray((arr * 255).astype(np.uint8))
-        self.processed_image = self.pil_to_qimage(depth_img)
+        self._depth_u8 = preview
+        self.processed_image = self.gray_to_qimage(self._depth_u8)
+        self._base_pixmap = QPixmap.fromImage(self.processed_image)
         self.update_zoomed_image()
         self.progress.setValue(100)
         self.statusBar().showMessage("Depth map generated.")
@@ -196,41 +269,44 @@ class CNCDepthMapGeneratorQt(QMainWindow):
         scale_x = width_mm / w
         scale_y = height_mm / h
 
-        lines = [
-            "(DepthMap generated G-code)",
-            "G90 ; absolute positioning",
-            "G21 ; millimeters",
-            "G0 Z5.000",
-        ]
-
         feedrate = 300.0
-        for y in range(0, h, pixel_step_y):
-            y_mm = y * scale_y
-            lines.append(f"G0 Y{y_mm:.3f}")
-            for x in range(0, w, pixel_step_x):
-                val = self.depth_array[y, x]
-                z = z_min + (1 - val) * (z_max - z_min)
-                x_mm = x * scale_x
-                lines.append(f"G1 X{x_mm:.3f} Z{z:.3f} F{feedrate:.1f}")
-            lines.append("G0 Z5.000")
-        lines.append("G0 X0 Y0 Z5.000")
-        lines.append("M2")
-
-        with open(path, "w") as f:
-            f.write("\n".join(lines))
+        with open(path, "wb", buffering=1 << 20) as f:
+            write = f.write
+            write(b"(DepthMap generated G-code)\n"
+                  b"G90 ; absolute positioning\n"
+                  b"G21 ; millimeters\n"
+                  b"G0 Z5.000\n")
+            # Work in integer microns (the 3 decimals G-code needs): each X
+            # column and each distinct Z level is formatted only once, and the
+            # per-point work is just joining pre-built byte strings.
+            sub = self.depth_array[::pixel_step_y, ::pixel_step_x]
+            z_um = np.rint((z_min + (1.0 - sub.astype(np.float64)) * (z_max - z_min)) * 1000).astype(np.int32)
+            x_um = np.rint(np.arange(sub.shape[1]) * pixel_step_x * scale_x * 1000).astype(np.int64)
+            x_words = [b"G1 X%s" % format_um(x) for x in x_um.tolist()]
+            levels, level_idx = np.unique(z_um, return_inverse=True)
+            z_text = [format_um(z) for z in levels.tolist()]
+            # Z and F are modal: F is sent once per row and Z only when it
+            # changes, otherwise the point maps to the bare-newline entry.
+            z_words = [b" Z%s\n" % t for t in z_text] + [b"\n"]
+            level_idx = level_idx.reshape(z_um.shape)
+            repeat = np.zeros(level_idx.shape, dtype=bool)
+            repeat[:, 1:] = level_idx[:, 1:] == level_idx[:, :-1]
+            level_idx[repeat] = len(z_text)
+            for yi, row in enumerate(level_idx.tolist()):
+                write(b"G0 Y%s\n" % format_um(round(yi * pixel_step_y * scale_y * 1000)))
+                write(b"%s Z%s F%.1f\n" % (x_words[0], z_text[row[0]], feedrate))
+                write(b"".join(map(bytes.__add__, x_words[1:], map(z_words.__getitem__, row[1:]))))
+                write(b"G0 Z5.000\n")
+            write(b"G0 X0 Y0 Z5.000\nM2")
 
         QMessageBox.information(self, "Export", f"G-code saved to:\n{path}")
 
     # ---------- Helpers ----------
-    def pil_to_qimage(self, im):
-        im = im.convert("L")
-        data = im.tobytes("raw", "L")
-        return QImage(data, im.width, im.height, QImage.Format.Format_Grayscale8)
-
-    def qimage_to_pil(self, qimg):
-        ptr = qimg.bits()
-        ptr.setsize(qimg.width() * qimg.height())
-        return Image.frombuffer("L", (qimg.width(), qimg.height()), bytes(ptr), "raw", "L", 0, 1)
+    def gray_to_qimage(self, arr):
+        """Wrap a contiguous uint8 array as a QImage without copying it.
+        The caller must keep ``arr`` alive for as long as the image is used."""
+        h, w = arr.shape
+        return QImage(arr.data, w, h, w, QImage.Format.Format_Grayscale8)
 
 
 # ---------- Entry ----------
@@ -5,6 +5,10 @@ DXF Editor Brian Wilson (Grump) and AI. Inspired by scorchworks
 import sys
 import os
 import math
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import numpy as np
 
 # --- ADDED 3 LINES BELOW ---
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -24,16 +28,16 @@ from PyQt6.QtWidgets import (
     QLabel, QPushButton, QComboBox, QCheckBox, QDoubleSpinBox,
     QSpinBox, QGroupBox, QFileDialog, QMessageBox, QStatusBar,
     QSplitter, QTextEdit, QListWidget, QListWidgetItem,
-    QToolBar, QToolButton, QScrollArea, QFrame, QSizePolicy
+    QToolBar, QToolButton, QScrollArea, QFrame, QSizePolicy, QButtonGroup
 )
 from PyQt6.QtCore import (
-    Qt, pyqtSignal, QPointF, QRectF, QSize
+    Qt, pyqtSignal, QPointF, QRectF, QLineF, QSize, QTimer, QEvent, QThread
 )
 from PyQt6.QtGui import (
     QPainter, QColor, QPen, QBrush, QFont, QPixmap, QIcon,
-    QPainterPath, QKeySequence, QTransform, QAction, QPalette
+    QPainterPath, QKeySequence, QTransform, QAction, QPalette, QPolygonF
 )
-from PyQt6.QtPrintSupport import QPrintDialog, QPrinter
+# QtPrintSupport is imported in print_dxf(): printing is rare and the module is heavy
 
 
 
@@ -47,14 +51,208 @@ def apply_dxf_theme(app, theme: str = "dark", color: str = "grey"):
     return apply_theme(app, theme, color)
 
 
+# =======================================================
+# Drawn item record
+# =======================================================
+@dataclass(slots=True, eq=False)
+class DrawItem:
+    type: str                 # 'line' | 'circle' | 'rectangle' | 'polyline'
+    points: list              # [(x, y), ...]; circles: [(cx, cy), r]
+    selected: bool = False
+    bbox: tuple = None        # (minx, miny, maxx, maxy), set by DXFCanvas.add_item
+    pts_np: object = None     # polylines: (N, 2) float64 copy of points
+    segs: tuple = None        # polylines: (starts, deltas, 1/len^2) for hit tests
+    seq: int = 0              # draw order stamp, higher = on top
+
+
+# =======================================================
+# Spatial index over item bounding boxes
+# =======================================================
+class SpatialIndex:
+    """
+    Uniform-grid bucket index: each grid cell maps to the items whose bbox
+    touches it. Items spanning more than MAX_CELLS cells are kept in a small
+    overflow set that every query returns.
+    """
+    MAX_CELLS = 256
+
+    def __init__(self, cell_size=10.0):
+        self.cell_size = cell_size
+        self._cells = {}     # (i, j) -> {id(item): item}
+        self._spans = {}     # id(item) -> (i0, j0, i1, j1), or () if overflow
+        self._overflow = {}  # id(item) -> item
+
+    def _span(self, x0, y0, x1, y1):
+        s = self.cell_size
+        i0, j0 = math.floor(x0 / s), math.floor(y0 / s)
+        i1, j1 = math.floor(x1 / s), math.floor(y1 / s)
+        if (i1 - i0 + 1) * (j1 - j0 + 1) > self.MAX_CELLS:
+            return ()
+        return (i0, j0, i1, j1)
+
+    def clear(self):
+        self._cells.clear()
+        self._spans.clear()
+        self._overflow.clear()
+
+    def insert(self, item, bbox):
+        key = id(item)
+        span = self._span(*bbox)
+        self._spans[key] = span
+        if not span:
+            self._overflow[key] = item
+            return
+        i0, j0, i1, j1 = span
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                self._cells.setdefault((i, j), {})[key] = item
+
+    def remove(self, item):
+        key = id(item)
+        span = self._spans.pop(key, None)
+        if span is None:
+            return
+        if not span:
+            self._overflow.pop(key, None)
+            return
+        i0, j0, i1, j1 = span
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = self._cells.get((i, j))
+                if cell is not None:
+                    cell.pop(key, None)
+                    if not cell:
+                        del self._cells[(i, j)]
+
+    def query(self, x0, y0, x1, y1):
+        """Items whose cells overlap the box (a superset of true bbox hits)."""
+        found = dict(self._overflow)
+        span = self._span(x0, y0, x1, y1)
+        if not span:
+            for cell in self._cells.values():
+                found.update(cell)
+            return list(found.values())
+        i0, j0, i1, j1 = span
+        cells = self._cells
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = cells.get((i, j))
+                if cell:
+                    found.update(cell)
+        return list(found.values())
+
+
+# =======================================================
+# DXF loading (entity extraction + background reader)
+# =======================================================
+def _line_entry(e):
+    s, t = e.dxf.start, e.dxf.end
+    return ('line', [(s.x, s.y), (t.x, t.y)])
+
+
+def _circle_entry(e):
+    c = e.dxf.center
+    return ('circle', [(c.x, c.y), e.dxf.radius])
+
+
+def _lwpolyline_entry(e):
+    pts = e.get_points('xy')   # list of (x, y) in one call
+    if not pts:
+        return None
+    if e.closed:
+        pts.append(pts[0])
+    return ('polyline', pts)
+
+
+def _polyline_entry(e):
+    pts = [(loc.x, loc.y) for loc in (v.dxf.location for v in e.vertices())]
+    return ('polyline', pts) if pts else None
+
+
+_ENTRY_READERS = {
+    'LINE': _line_entry,
+    'CIRCLE': _circle_entry,
+    'LWPOLYLINE': _lwpolyline_entry,
+    'POLYLINE': _polyline_entry,
+}
+_ENTRY_QUERY = ' '.join(_ENTRY_READERS)
+
+
+def doc_entries(doc, progress=None):
+    """
+    (type, points) for every LINE/CIRCLE/(LW)POLYLINE in doc's modelspace, in
+    document order, ready for DXFCanvas.add_items(). progress(n) is called
+    every 1024 entities.
+    """
+    entries = []
+    add = entries.append
+    readers = _ENTRY_READERS
+    # One query keeps document order (= draw order) and drops other types up front
+    for n, e in enumerate(doc.modelspace().query(_ENTRY_QUERY), 1):
+        if progress and not n % 1024:
+            progress(n)
+        try:
+            entry = readers[e.dxftype()](e)
+        except Exception:
+            continue   # skip malformed entities, as before
+        if entry:
+            add(entry)
+    return entries
+
+
+class DXFLoadWorker(QThread):
+    """Reads a DXF file and extracts its canvas entries off the GUI thread."""
+    progress = pyqtSignal(int, int)                 # job, entities so far
+    loaded = pyqtSignal(int, str, object, object)   # job, path, doc, entries
+    error = pyqtSignal(int, str)                    # job, message
+
+    def __init__(self, job: int, path: str):
+        super().__init__()
+        self._job = job
+        self._path = path
+
+    def run(self):
+        try:
+            doc = ezdxf.readfile(self._path)
+            entries = doc_entries(doc, lambda n: self.progress.emit(self._job, n))
+        except Exception as e:
+            self.error.emit(self._job, str(e))
+            return
+        self.loaded.emit(self._job, self._path, doc, entries)
+
+
+class DXFSaveWorker(QThread):
+    """Writes an already-exported ezdxf document to disk off the GUI thread."""
+    saved = pyqtSignal(str, object)   # path, doc
+    error = pyqtSignal(str)
+
+    def __init__(self, doc, path: str):
+        super().__init__()
+        self._doc = doc
+        self._path = path
+
+    def run(self):
+        try:
+            self._doc.saveas(self._path)
+        except Exception as e:
+            self.error.emit(str(e))
+            return
+        self.saved.emit(self._path, self._doc)
+
+
 # =======================================================
 # Canvas widget (zoom/pan/draw/select/grid/snap)
 # =======================================================
 class DXFCanvas(QWidget):
     mouseMoved = pyqtSignal(float, float)
     itemSelected = pyqtSignal(object)
+    itemAdded    = pyqtSignal(object)   # drawn by the user (not bulk loads)
+    itemRemoved  = pyqtSignal(object, int)  # item, its former index in drawn_items
     viewChanged  = pyqtSignal()
 
+    LOD_DOT_PX = 2.0          # items smaller than this on screen are drawn as a dot
+    LOD_MIN_VERTICES = 256    # polylines longer than this are thinned to one vertex run per pixel
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumSize(600, 400)
@@ -65,12 +263,34 @@ class DXFCanvas(QWidget):
         self.offset_x = 0.0
         self.offset_y = 0.0
         self.grid_step = 1.0
+        self._inv_grid_step = 1.0
+        self._snap_last = None  # (wx, wy, step, snapped) of the previous snap_point call
+        self._grid_key = None   # scale the grid_step was computed for
+        self._vis_key = None    # view state the cached visible rect is for
+        self._vis_rect = None
+        self._update_pending = False
+        self._dirty_rect = None     # pending repaint area (screen QRectF), None = whole widget
+        self._temp_rect = None      # screen area covered by temp_items at the last paint request
+        # Grid, axes and drawn items are cached in a pixmap; paintEvent only
+        # redraws the overlay (temp items, selection handles) on top of it.
+        # The pixmap has a margin around the widget so pans just shift it.
+        self._static_pixmap = None
+        self._static_key = None     # (scale, w, h, dpr) the pixmap was rendered for
+        self._static_origin = (0.0, 0.0, 0, 0)  # offset_x, offset_y, margin x, margin y
+        self._paint_view = None     # view state at the last paint
+        self._static_dirty = True
+        self._static_regions = []   # world bboxes to re-render in the pixmap next paint
 
         # Items
-        self.drawn_items = []     # {'type': 'line'|'circle'|'rectangle'|'polyline', 'points': [...], 'selected': bool}
+        self.drawn_items = []     # [DrawItem]
         self.temp_items = []
         self.selected_item = None
         self.hover_item = None
+        self._index = SpatialIndex()   # hit-test index over item.bbox
+        self._seq = 0                  # next DrawItem.seq
+        self._bulk = 0                 # bulk_update() nesting depth
+        self._scene_bbox = None        # union of item bboxes, None = empty
+        self._scene_bbox_dirty = False # recompute lazily after removals
 
         # Interaction
         self.panning = False
@@ -89,9 +309,27 @@ class DXFCanvas(QWidget):
         self.axes_color = QColor(150, 150, 150)
         self.selection_color = QColor(255, 80, 80)
         self.hover_color = QColor(255, 200, 0)
+        self._rebuild_pens()
 
         self.setMouseTracking(True)
 
+    def _rebuild_pens(self):
+        """Canvas pens, built once per theme/palette change instead of per item per paint."""
+        accent = self.palette().color(QPalette.ColorRole.Highlight)
+        self._pen_normal = QPen(accent, 2)
+        self._pen_temp = QPen(accent, 2, Qt.PenStyle.DashLine)
+        self._pen_selected = QPen(self.selection_color, 3)
+        self._pen_handles = QPen(self.selection_color, 1, Qt.PenStyle.DashLine)
+        self._pen_grid = QPen(self.grid_color, 1)
+        self._pen_axes = QPen(self.axes_color, 2)
+        self._static_dirty = True
+
+    def changeEvent(self, e):
+        if e.type() in (QEvent.Type.PaletteChange, QEvent.Type.ApplicationPaletteChange) \
+                and hasattr(self, '_pen_normal'):
+            self._rebuild_pens()
+        super().changeEvent(e)
+
     def update_theme_colors(self, theme_colors):
         """
         Update canvas colors based on theme
@@ -104,8 +342,26 @@ class DXFCanvas(QWidget):
         
         self.selection_color = QColor(255, 80, 80)  # Keep selection red for visibility
         self.hover_color = QColor(255, 200, 0)  # Keep hover yellow for visibility
-        
-        self.update()
+        self._rebuild_pens()
+
+        self.invalidate()
+
+    def invalidate(self, bbox=None):
+        """
+        Re-render the cached item layer on the next paint: only the area of the
+        world bbox (minx, miny, maxx, maxy) if given, else all of it.
+        """
+        if self._bulk:
+            return  # bulk_update() repaints everything once at the end
+        if bbox is None or self._static_pixmap is None or self._static_dirty:
+            self._static_dirty = True
+            self._static_regions = []
+            self.update()
+            return
+        self._static_regions.append(bbox)
+        w2s = self._make_w2s()
+        x0, y0, x1, y1 = bbox
+        self.update(QRectF(w2s(x0, y0), w2s(x1, y1)).normalized().adjusted(-5, -5, 5, 5).toAlignedRect())
 
     # ------------- coordinate helpers -------------
     def world_to_screen(self, wx, wy):
@@ -113,6 +369,16 @@ class DXFCanvas(QWidget):
         sy = -wy * self.scale + self.offset_y + self.height()/2
         return QPointF(sx, sy)
 
+    def _make_w2s(self, offset_x=None, offset_y=None):
+        """world_to_screen with the view state bound as locals, for paint loops."""
+        if offset_x is None:
+            offset_x, offset_y = self.offset_x, self.offset_y
+        s, ox, oy = self.scale, offset_x + self.width()/2, offset_y + self.height()/2
+        def w2s(x, y):
+            return QPointF(x*s + ox, oy - y*s)
+        w2s.xform = (s, ox, oy)   # same mapping for NumPy callers
+        return w2s
+
     def screen_to_world(self, sx, sy):
         wx = (sx - self.width()/2 - self.offset_x) / self.scale
         wy = -(sy - self.height()/2 - self.offset_y) / self.scale
@@ -121,202 +387,493 @@ class DXFCanvas(QWidget):
     def snap_point(self, wx, wy):
         if not self.snap_to_grid:
             return (wx, wy)
-        step = max(self.grid_step, 1e-9)
-        return (round(wx/step)*step, round(wy/step)*step)
+        step = self.grid_step
+        last = self._snap_last
+        if last is not None and last[0] == wx and last[1] == wy and last[2] == step:
+            return last[3]
+        inv = self._inv_grid_step
+        snapped = (round(wx*inv)*step, round(wy*inv)*step)
+        self._snap_last = (wx, wy, step, snapped)
+        return snapped
 
     # ------------- add/select -------------
+    def _make_item(self, item_type, points):
+        it = DrawItem(item_type, list(points), seq=self._seq)
+        self._seq += 1
+        if item_type == 'polyline':
+            pts_np = np.asarray(it.points, dtype=np.float64).reshape(-1, 2)
+            lo, hi = pts_np.min(0), pts_np.max(0)
+            it.bbox = (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+            it.pts_np = pts_np
+            it.segs = self._polyline_segments(pts_np)
+        else:
+            it.bbox = self._item_bbox(item_type, it.points)
+        return it
+
     def add_item(self, item_type, points, properties=None):
-        it = {'type': item_type, 'points': points[:], 'selected': False}
+        it = self._make_item(item_type, points)
         self.drawn_items.append(it)
-        self.update()
+        self._index.insert(it, it.bbox)
+        sb = self._scene_bbox
+        if sb is None:
+            self._scene_bbox = it.bbox
+        elif not self._scene_bbox_dirty:
+            x0, y0, x1, y1 = it.bbox
+            self._scene_bbox = (min(sb[0], x0), min(sb[1], y0), max(sb[2], x1), max(sb[3], y1))
+        self.invalidate(it.bbox)
         return it
 
-    def clear_selection(self):
-        for it in self.drawn_items:
-            it['selected'] = False
+    @contextmanager
+    def bulk_update(self):
+        """Batch many add/remove calls: no per-item repaints, one reindex and repaint at the end."""
+        self._bulk += 1
+        try:
+            yield self
+        finally:
+            self._bulk -= 1
+            if not self._bulk:
+                self.reindex()
+                self.invalidate()
+
+    def add_items(self, entries):
+        """Bulk add_item for loaders: [(item_type, points), ...]."""
+        with self.bulk_update():
+            new = [self._make_item(t, pts) for t, pts in entries]
+            self.drawn_items.extend(new)
+            self._scene_bbox_dirty = True
+        return new
+
+    def remove_item(self, it):
+        row = self.drawn_items.index(it)
+        del self.drawn_items[row]
+        self._index.remove(it)
+        self._scene_bbox_dirty = True
+        if self.selected_item is it:
+            self.selected_item = None
+        if self.hover_item is it:
+            self.hover_item = None
+        self.itemRemoved.emit(it, row)
+        self.invalidate(it.bbox)
+
+    def clear_items(self):
+        self.drawn_items = []
+        self._index.clear()
+        self._scene_bbox = None
+        self._scene_bbox_dirty = False
         self.selected_item = None
-        self.update()
+        self.hover_item = None
+        self.invalidate()
+
+    def reindex(self):
+        """Rebuild the spatial index with a cell size suited to the items (after bulk loads)."""
+        median = 0.0
+        if self.drawn_items:
+            b = np.array([it.bbox for it in self.drawn_items], dtype=np.float64)
+            sizes = np.maximum(b[:, 2] - b[:, 0], b[:, 3] - b[:, 1])
+            median = float(np.partition(sizes, len(sizes)//2)[len(sizes)//2])
+        self._index = SpatialIndex(cell_size=median*2 if median > 0 else 10.0)
+        for it in self.drawn_items:
+            self._index.insert(it, it.bbox)
+
+    def scene_bbox(self):
+        """(minx, miny, maxx, maxy) over all drawn items, or None if there are none."""
+        if self._scene_bbox_dirty:
+            self._scene_bbox_dirty = False
+            if self.drawn_items:
+                b = np.array([it.bbox for it in self.drawn_items], dtype=np.float64)
+                lo, hi = b[:, :2].min(0), b[:, 2:].max(0)
+                self._scene_bbox = (float(lo[0]), float(lo[1]), float(hi[0]), float(hi[1]))
+            else:
+                self._scene_bbox = None
+        return self._scene_bbox
+
+    @staticmethod
+    def _item_bbox(t, pts):
+        if t == 'circle':
+            (cx, cy), r = pts
+            return (cx - r, cy - r, cx + r, cy + r)
+        if len(pts) == 2:  # lines, rectangles
+            (x1, y1), (x2, y2) = pts
+            return (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        xs = [p[0] for p in pts]; ys = [p[1] for p in pts]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def _items_at(self, wx, wy, tol):
+        """
+        Index candidates whose bbox is within tol of (wx, wy), top-most first:
+        the same order as walking drawn_items in reverse.
+        """
+        tol2 = tol*tol
+        hits = []
+        for it in self._index.query(wx - tol, wy - tol, wx + tol, wy + tol):
+            x0, y0, x1, y1 = it.bbox
+            dx = max(x0 - wx, 0.0, wx - x1)
+            dy = max(y0 - wy, 0.0, wy - y1)
+            if dx*dx + dy*dy <= tol2:
+                hits.append(it)
+        hits.sort(key=lambda it: -it.seq)
+        return hits
+
+    def clear_selection(self):
+        # Only selected_item is ever flagged, so only its area needs repainting
+        it = self.selected_item
+        if it is not None:
+            it.selected = False
+            self.selected_item = None
+            self.invalidate(it.bbox)
 
     def select_item_at(self, wx, wy, tol_px=5.0):
         tol = tol_px / self.scale
-        for it in reversed(self.drawn_items):
+        for it in self._items_at(wx, wy, tol):
             if self._near_item(wx, wy, it, tol):
                 self.clear_selection()
-                it['selected'] = True
+                it.selected = True
                 self.selected_item = it
                 self.itemSelected.emit(it)
-                self.update()
+                self.invalidate(it.bbox)
                 return it
         self.clear_selection()
         self.itemSelected.emit(None)
         return None
 
     def _near_item(self, x, y, it, tol):
-        t = it['type']
-        pts = it['points']
+        # Cheap reject: outside the tol-expanded bbox can't be near the shape
+        bbox = it.bbox
+        if bbox is not None:
+            bx0, by0, bx1, by1 = bbox
+            if x < bx0 - tol or x > bx1 + tol or y < by0 - tol or y > by1 + tol:
+                return False
+        # All tests compare squared distances against tol**2: no sqrt per call
+        t = it.type
+        pts = it.points
+        tol2 = tol*tol
+        dist2 = self._point_line_dist2
         if t == 'line':
             (x1, y1), (x2, y2) = pts
-            return self._point_line_dist(x, y, x1, y1, x2, y2) <= tol
+            return dist2(x, y, x1, y1, x2, y2) <= tol2
         if t == 'circle':
             (cx, cy), radius = pts
-            return abs(math.hypot(x - cx, y - cy) - radius) <= tol
+            dd = (x - cx)**2 + (y - cy)**2
+            inner = max(radius - tol, 0.0)
+            return inner*inner <= dd <= (radius + tol)**2
         if t == 'rectangle':
-            (x1, y1), (x2, y2) = pts
-            xs = sorted([x1, x2]); ys = sorted([y1, y2])
-            # near any edge
-            edges = [((xs[0], ys[0]), (xs[1], ys[0])),
-                     ((xs[1], ys[0]), (xs[1], ys[1])),
-                     ((xs[1], ys[1]), (xs[0], ys[1])),
-                     ((xs[0], ys[1]), (xs[0], ys[0]))]
-            return any(self._point_line_dist(x, y, a[0], a[1], b[0], b[1]) <= tol for a, b in edges)
+            # it.bbox is the normalised rectangle, so the edge distance is
+            # closed-form: outside, distance to the box; inside, to the nearest side
+            x0, y0, x1, y1 = it.bbox
+            ox = max(x0 - x, 0.0, x - x1)
+            oy = max(y0 - y, 0.0, y - y1)
+            if ox or oy:
+                return ox*ox + oy*oy <= tol2
+            return min(x - x0, x1 - x, y - y0, y1 - y) <= tol
         if t == 'polyline':
             if len(pts) < 2: return False
-            for i in range(len(pts)-1):
-                (x1, y1), (x2, y2) = pts[i], pts[i+1]
-                if self._point_line_dist(x, y, x1, y1, x2, y2) <= tol:
-                    return True
+            segs = it.segs
+            if segs is None:
+                segs = self._polyline_segments(np.asarray(pts, dtype=np.float64))
+            return self._polyline_near(x, y, segs, tol2)
         return False
 
     @staticmethod
-    def _point_line_dist(px, py, x1, y1, x2, y2):
+    def _polyline_segments(pts_np):
+        """Per-segment start x/y, delta x/y and 1/length^2 (0 for degenerate segments)."""
+        ax, ay = pts_np[:-1, 0].copy(), pts_np[:-1, 1].copy()
+        dx, dy = np.diff(pts_np[:, 0]), np.diff(pts_np[:, 1])
+        len2 = dx*dx + dy*dy
+        inv = np.divide(1.0, len2, out=np.zeros_like(len2), where=len2 > 0)
+        return ax, ay, dx, dy, inv
+
+    @staticmethod
+    def _polyline_near(x, y, segs, tol2):
+        """True if (x, y) is within sqrt(tol2) of any segment in segs."""
+        ax, ay, dx, dy, inv = segs
+        rx, ry = x - ax, y - ay
+        u = np.clip((rx*dx + ry*dy) * inv, 0.0, 1.0)
+        ex, ey = rx - u*dx, ry - u*dy
+        return bool((ex*ex + ey*ey).min() <= tol2)
+
+    @staticmethod
+    def _point_line_dist2(px, py, x1, y1, x2, y2):
+        """Squared distance from a point to a segment."""
         dx, dy = x2 - x1, y2 - y1
         if dx == 0 and dy == 0:
-            return math.hypot(px - x1, py - y1)
+            return (px - x1)**2 + (py - y1)**2
         u = max(0.0, min(1.0, ((px - x1)*dx + (py - y1)*dy) / (dx*dx + dy*dy)))
-        cx, cy = x1 + u*dx, y1 + u*dy
-        return math.hypot(px - cx, py - cy)
+        ex, ey = px - (x1 + u*dx), py - (y1 + u*dy)
+        return ex*ex + ey*ey
 
     # ------------- painting -------------
+    def _request_update(self, rect=None):
+        """
+        Coalesce repaints from high-rate mouse events to one per ~16 ms.
+        rect (screen QRectF) limits the repaint to that area; None repaints everything.
+        """
+        if not self._update_pending:
+            self._update_pending = True
+            self._dirty_rect = rect
+            QTimer.singleShot(16, self._flush_update)
+        elif self._dirty_rect is not None:
+            self._dirty_rect = None if rect is None else self._dirty_rect.united(rect)
+
+    def _flush_update(self):
+        self._update_pending = False
+        r = self._dirty_rect
+        if r is None:
+            self.update()
+        else:
+            self.update(r.toAlignedRect())
+
+    def _temp_screen_rect(self):
+        """Screen rect covering temp_items (pen width included), or None."""
+        w2s = self._make_w2s()
+        rect = None
+        for it in self.temp_items:
+            x0, y0, x1, y1 = self._item_bbox(it.type, it.points)
+            r = QRectF(w2s(x0, y0), w2s(x1, y1)).normalized().adjusted(-3, -3, 3, 3)
+            rect = r if rect is None else rect.united(r)
+        return rect
+
     def paintEvent(self, event):
+        dpr = self.devicePixelRatioF()
+        key = (self.scale, self.width(), self.height(), dpr)
+        ox0, oy0, mx, my = self._static_origin
+        dx, dy = self.offset_x - ox0, self.offset_y - oy0
+        if self._static_dirty or key != self._static_key or abs(dx) > mx or abs(dy) > my:
+            self._rebuild_static_layer(dpr)
+            self._static_key = key
+            self._static_dirty = False
+            self._static_regions = []
+            ox0, oy0, mx, my = self._static_origin
+            dx = dy = 0.0
+        elif self._static_regions:
+            self._repaint_static_regions()
+        view = (self.scale, self.offset_x, self.offset_y, self.width(), self.height())
+        if view != self._paint_view:
+            self._paint_view = view
+            if self.temp_items:
+                self._temp_rect = self._temp_screen_rect()  # view moved under it
+
         p = QPainter(self)
+        p.drawPixmap(QPointF(dx - mx, dy - my), self._static_pixmap)
         p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        w2s = self._make_w2s()
+        draw = self._draw_item
+        for it in self.temp_items:
+            draw(p, it, w2s, True)
 
+        if self.selected_item:
+            self._draw_selection(p, self.selected_item, w2s)
+
+    def _rebuild_static_layer(self, dpr):
+        w, h = self.width(), self.height()
+        mx, my = w // 4, h // 4
+        pm = QPixmap(QSize(max(1, round((w + 2*mx)*dpr)), max(1, round((h + 2*my)*dpr))))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(self.palette().color(QPalette.ColorRole.Window))
+        p = QPainter(pm)
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        p.translate(mx, my)
+        w2s = self._make_w2s()
+        r = self._visible_world_rect()
+        ex, ey = mx / self.scale, my / self.scale
+        vis = QRectF(QPointF(r.left() - ex, r.top() + ey), QPointF(r.right() + ex, r.bottom() - ey))
+        self._paint_scene(p, w2s, vis)
+        p.end()
+        self._static_pixmap = pm
+        self._static_origin = (self.offset_x, self.offset_y, mx, my)
+
+    def _repaint_static_regions(self):
+        """Re-render just the queued world bboxes into the existing pixmap."""
+        ox0, oy0, mx, my = self._static_origin
+        w2s = self._make_w2s(ox0, oy0)
+        s = self.scale
+        cx, cy = ox0 + self.width()/2, oy0 + self.height()/2
+        bg = self.palette().color(QPalette.ColorRole.Window)
+        p = QPainter(self._static_pixmap)
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        p.translate(mx, my)
+        for x0, y0, x1, y1 in self._static_regions:
+            r = QRectF(w2s(x0, y0), w2s(x1, y1)).normalized().adjusted(-5, -5, 5, 5).toAlignedRect()
+            p.setClipRect(r)
+            p.fillRect(r, bg)
+            vis = QRectF(QPointF((r.left() - cx)/s, (cy - r.top())/s),
+                         QPointF((r.right() + 1 - cx)/s, (cy - r.bottom() - 1)/s))
+            self._paint_scene(p, w2s, vis)
+        p.end()
+        self._static_regions = []
+
+    def render_scene(self, p: QPainter):
+        """Paint the current view (no selection handles or rubber band) with vector
+        calls on any painter whose window is this widget's rect, e.g. a printer."""
         p.fillRect(self.rect(), self.palette().color(QPalette.ColorRole.Window))
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self._paint_scene(p, self._make_w2s(), self._visible_world_rect(), lod=False)
+
+    def _paint_scene(self, p: QPainter, w2s, vis, lod=True):
+        """Grid, axes and the drawn items that fall inside world rect vis.
+        lod thins detail below a screen pixel; off for full-resolution output."""
         if self.show_grid:
-            self._draw_grid(p)
+            self._draw_grid(p, w2s, vis)
         if self.show_axes:
-            self._draw_axes(p)
-
-        # items
-        for it in self.drawn_items:
-            self._draw_item(p, it, is_temp=False)
-        for it in self.temp_items:
-            self._draw_item(p, it, is_temp=True)
-
-        if self.selected_item:
-            self._draw_selection(p, self.selected_item)
-
-    def _draw_grid(self, p: QPainter):
-        p.save()
-        p.setPen(QPen(self.grid_color, 1))
-        vis = self._visible_world_rect()
-
-        target_px = 40.0
-        step_w = target_px / self.scale
-        exp = math.floor(math.log10(max(step_w, 1e-9)))
-        base = step_w / (10 ** exp)
-        if base <= 1.5:
-            nice = 1
-        elif base <= 3.5:
-            nice = 2
+            self._draw_axes(p, w2s, vis)
+
+        # items (skip those whose cached bbox is outside the view; the
+        # margin covers pen width)
+        m = 3.0 / self.scale
+        vx0, vx1 = vis.left() - m, vis.right() + m
+        vy0, vy1 = vis.bottom() - m, vis.top() + m
+        # Only index candidates for the view, in draw order; when zoomed out far
+        # enough that they are everything, drawn_items is already in order
+        items = self._index.query(vx0, vy0, vx1, vy1)
+        if len(items) < len(self.drawn_items):
+            items.sort(key=lambda it: it.seq)
         else:
-            nice = 5
-        self.grid_step = nice * (10 ** exp)
-
+            items = self.drawn_items
+        # Unselected items all share one pen, so lines and rectangles go to Qt
+        # in one drawLines()/drawRects() call each; selected items go on top
+        # With lod, items smaller than LOD_DOT_PX on screen are just a dot at their centre
+        lines, rects, rest, selected, dots = [], [], [], [], []
+        tiny = self.LOD_DOT_PX / self.scale if lod else 0.0
+        for it in items:
+            bx0, by0, bx1, by1 = it.bbox
+            if bx1 < vx0 or bx0 > vx1 or by1 < vy0 or by0 > vy1:
+                continue
+            if it.selected:
+                selected.append(it)
+                continue
+            if bx1 - bx0 < tiny and by1 - by0 < tiny:
+                dots.append(w2s((bx0 + bx1)/2, (by0 + by1)/2))
+                continue
+            t = it.type
+            if t == 'line':
+                (x1, y1), (x2, y2) = it.points
+                lines.append(QLineF(w2s(x1, y1), w2s(x2, y2)))
+            elif t == 'rectangle':
+                (x1, y1), (x2, y2) = it.points
+                rects.append(QRectF(w2s(x1, y1), w2s(x2, y2)).normalized())
+            else:
+                rest.append(it)
+        p.setPen(self._pen_normal)
+        if lines:
+            p.drawLines(lines)
+        if rects:
+            p.drawRects(rects)
+        if dots:
+            p.drawPoints(QPolygonF(dots))
+        draw = self._draw_item
+        for it in rest:
+            draw(p, it, w2s, lod=lod)
+        for it in selected:
+            draw(p, it, w2s, lod=lod)
+
+    def _draw_grid(self, p: QPainter, w2s, vis):
+        p.setPen(self._pen_grid)
+
+        if self._grid_key != self.scale:
+            target_px = 40.0
+            step_w = target_px / self.scale
+            exp = math.floor(math.log10(max(step_w, 1e-9)))
+            base = step_w / (10 ** exp)
+            if base <= 1.5:
+                nice = 1
+            elif base <= 3.5:
+                nice = 2
+            else:
+                nice = 5
+            self.grid_step = nice * (10 ** exp)
+            self._inv_grid_step = 1.0 / self.grid_step
+            self._grid_key = self.scale
+
+        # collect all grid lines and hand them to Qt in one call
+        lines = []
+        step = self.grid_step
+        left, right, top, bottom = vis.left(), vis.right(), vis.top(), vis.bottom()
         # verticals
-        x = math.floor(vis.left() / self.grid_step) * self.grid_step
-        while x <= vis.right():
-            a = self.world_to_screen(x, vis.top())
-            b = self.world_to_screen(x, vis.bottom())
-            p.drawLine(a, b)
-            x += self.grid_step
+        x = math.floor(left / step) * step
+        while x <= right:
+            lines.append(QLineF(w2s(x, top), w2s(x, bottom)))
+            x += step
 
         # horizontals
-        y = math.floor(vis.bottom() / self.grid_step) * self.grid_step
-        while y <= vis.top():
-            a = self.world_to_screen(vis.left(), y)
-            b = self.world_to_screen(vis.right(), y)
-            p.drawLine(a, b)
-            y += self.grid_step
-
-        p.restore()
-
-    def _draw_axes(self, p: QPainter):
-        p.save()
-        p.setPen(QPen(self.axes_color, 2))
-        origin = self.world_to_screen(0, 0)
-        left   = self.world_to_screen(-10000, 0)
-        right  = self.world_to_screen(10000, 0)
-        top    = self.world_to_screen(0, 10000)
-        bot    = self.world_to_screen(0, -10000)
-        p.drawLine(left, right)
-        p.drawLine(bot, top)
-        p.restore()
-
-    def _draw_item(self, p: QPainter, it, is_temp=False):
-        p.save()
-        
-        # Use theme colors for drawing
-        text_color = self.palette().color(QPalette.ColorRole.Text)
-        accent_color = self.palette().color(QPalette.ColorRole.Highlight)
-        
-        pen = QPen(text_color, 2)
-        if is_temp:
-            pen.setStyle(Qt.PenStyle.DashLine)
-        if it.get('selected'):
-            pen.setColor(self.selection_color)
-            pen.setWidth(3)
+        y = math.floor(bottom / step) * step
+        while y <= top:
+            lines.append(QLineF(w2s(left, y), w2s(right, y)))
+            y += step
+
+        p.drawLines(lines)
+
+    def _draw_axes(self, p: QPainter, w2s, vis):
+        p.setPen(self._pen_axes)
+        # Only the part of each axis inside vis
+        if vis.bottom() <= 0 <= vis.top():
+            p.drawLine(w2s(vis.left(), 0), w2s(vis.right(), 0))
+        if vis.left() <= 0 <= vis.right():
+            p.drawLine(w2s(0, vis.bottom()), w2s(0, vis.top()))
+
+    def _draw_item(self, p: QPainter, it, w2s, is_temp=False, lod=True):
+        # Only the pen changes per item, so no save()/restore() is needed
+        if it.selected:
+            p.setPen(self._pen_selected)
+        elif is_temp:
+            p.setPen(self._pen_temp)
         else:
-            # Use accent color for normal items
-            pen.setColor(accent_color)
-            
-        p.setPen(pen)
+            p.setPen(self._pen_normal)
 
-        t = it['type']
-        pts = it['points']
+        t = it.type
+        pts = it.points
         if t == 'line':
-            p1, p2 = self.world_to_screen(*pts[0]), self.world_to_screen(*pts[1])
-            p.drawLine(p1, p2)
+            (x1, y1), (x2, y2) = pts
+            p.drawLine(w2s(x1, y1), w2s(x2, y2))
         elif t == 'rectangle':
-            r = QRectF(self.world_to_screen(*pts[0]), self.world_to_screen(*pts[1])).normalized()
-            p.drawRect(r)
+            (x1, y1), (x2, y2) = pts
+            p.drawRect(QRectF(w2s(x1, y1), w2s(x2, y2)).normalized())
         elif t == 'circle':
             (cx, cy), radius = pts
-            c = self.world_to_screen(cx, cy)
+            c = w2s(cx, cy)
             r = radius * self.scale
             p.drawEllipse(QRectF(c.x()-r, c.y()-r, 2*r, 2*r))
         elif t == 'polyline' and len(pts) >= 2:
-            path = QPainterPath(self.world_to_screen(*pts[0]))
-            for pt in pts[1:]:
-                path.lineTo(self.world_to_screen(*pt))
-            p.drawPath(path)
-
-        p.restore()
-
-    def _draw_selection(self, p: QPainter, it):
-        p.save()
-        pen = QPen(self.selection_color, 1, Qt.PenStyle.DashLine)
-        p.setPen(pen)
-        if it['type'] == 'line':
-            for pt in it['points']:
-                s = self.world_to_screen(*pt)
+            pts_np = it.pts_np
+            if pts_np is None:
+                pts_np = np.asarray(pts, dtype=np.float64)
+            s, ox, oy = w2s.xform
+            sx = pts_np[:, 0] * s + ox
+            sy = pts_np[:, 1] * -s + oy
+            if lod and len(sx) > self.LOD_MIN_VERTICES:
+                # Keep only the first and last vertex of each run inside one
+                # screen pixel: the dropped ones are within a pixel of the path
+                cx, cy = np.floor(sx), np.floor(sy)
+                moved = (cx[1:] != cx[:-1]) | (cy[1:] != cy[:-1])
+                keep = np.ones(len(sx), dtype=bool)
+                keep[1:-1] = moved[:-1] | moved[1:]
+                sx, sy = sx[keep], sy[keep]
+            p.drawPolyline(QPolygonF(list(map(QPointF, sx.tolist(), sy.tolist()))))
+
+    def _draw_selection(self, p: QPainter, it, w2s):
+        p.setPen(self._pen_handles)
+        if it.type == 'line':
+            for x, y in it.points:
+                s = w2s(x, y)
                 p.drawRect(QRectF(s.x()-3, s.y()-3, 6, 6))
-        elif it['type'] == 'circle':
-            c = self.world_to_screen(*it['points'][0])
+        elif it.type == 'circle':
+            c = w2s(*it.points[0])
             p.drawRect(QRectF(c.x()-3, c.y()-3, 6, 6))
-        elif it['type'] == 'rectangle':
+        elif it.type == 'rectangle':
             # corners
-            (x1,y1),(x2,y2) = it['points']
-            for pt in [(x1,y1),(x1,y2),(x2,y1),(x2,y2)]:
-                s = self.world_to_screen(*pt)
+            (x1,y1),(x2,y2) = it.points
+            for x, y in [(x1,y1),(x1,y2),(x2,y1),(x2,y2)]:
+                s = w2s(x, y)
                 p.drawRect(QRectF(s.x()-3, s.y()-3, 6, 6))
-        p.restore()
 
     def _visible_world_rect(self):
-        r = self.rect()
-        tl = self.screen_to_world(r.left(), r.top())
-        br = self.screen_to_world(r.right(), r.bottom())
-        return QRectF(QPointF(tl[0], tl[1]), QPointF(br[0], br[1]))
+        # Memoised on the view state; called several times per paint
+        key = (self.scale, self.offset_x, self.offset_y, self.width(), self.height())
+        if key != self._vis_key:
+            r = self.rect()
+            tl = self.screen_to_world(r.left(), r.top())
+            br = self.screen_to_world(r.right(), r.bottom())
+            self._vis_rect = QRectF(QPointF(tl[0], tl[1]), QPointF(br[0], br[1]))
+            self._vis_key = key
+        return self._vis_rect
 
     # ------------- interaction -------------
     def wheelEvent(self, e):
@@ -358,19 +915,20 @@ class DXFCanvas(QWidget):
             self.offset_x += d.x()
             self.offset_y += d.y()
             self.last_pan_point = e.position()
-            self.update()
+            self._request_update()
         elif self.drawing and self.current_tool != "select":
             self._continue_drawing(sx, sy)
         else:
             # hover
             old = self.hover_item
             self.hover_item = None
-            for it in reversed(self.drawn_items):
-                if self._near_item(wx, wy, it, 5.0/self.scale):
+            tol = 5.0/self.scale
+            for it in self._items_at(wx, wy, tol):
+                if self._near_item(wx, wy, it, tol):
                     self.hover_item = it
                     break
-            if self.hover_item != old:
-                self.update()
+            if self.hover_item is not old:
+                self._request_update()
 
     def mouseReleaseEvent(self, e):
         wx, wy = self.screen_to_world(e.position().x(), e.position().y())
@@ -388,9 +946,7 @@ class DXFCanvas(QWidget):
 
     def keyPressEvent(self, e):
         if e.key() == Qt.Key.Key_Delete and self.selected_item:
-            self.drawn_items.remove(self.selected_item)
-            self.selected_item = None
-            self.update()
+            self.remove_item(self.selected_item)
             e.accept()
             return
         if e.key() == Qt.Key.Key_Escape:
@@ -432,8 +988,9 @@ class DXFCanvas(QWidget):
             else:
                 it = None
             if it:
+                self.itemAdded.emit(it)
                 self.clear_selection()
-                it['selected'] = True
+                it.selected = True
                 self.selected_item = it
                 self.itemSelected.emit(it)
         self._cancel_drawing()
@@ -442,48 +999,53 @@ class DXFCanvas(QWidget):
         self.drawing = False
         self.current_points = []
         self.temp_items = []
+        self._temp_rect = None
         self.update()
 
     def _update_temp_item(self):
         self.temp_items = []
         if len(self.current_points) < 2:
-            self.update(); return
+            self._request_temp_update(); return
         t = self.current_tool
         if t == "line":
-            self.temp_items.append({'type':'line', 'points': self.current_points[:]})
+            self.temp_items.append(DrawItem('line', self.current_points[:]))
         elif t == "rectangle":
-            self.temp_items.append({'type':'rectangle', 'points': self.current_points[:]})
+            self.temp_items.append(DrawItem('rectangle', self.current_points[:]))
         elif t == "circle":
             c, rp = self.current_points[0], self.current_points[-1]
             r = math.hypot(rp[0]-c[0], rp[1]-c[1])
-            self.temp_items.append({'type':'circle', 'points':[c, r]})
+            self.temp_items.append(DrawItem('circle', [c, r]))
         elif t == "polyline":
-            self.temp_items.append({'type':'polyline', 'points': self.current_points[:]})
-        self.update()
+            self.temp_items.append(DrawItem('polyline', self.current_points[:]))
+        self._request_temp_update()
+
+    def _request_temp_update(self):
+        # Only the area the rubber band left plus the area it now covers
+        old, new = self._temp_rect, self._temp_screen_rect()
+        self._temp_rect = new
+        if old is None or new is None:
+            dirty = new if old is None else old
+        else:
+            dirty = old.united(new)
+        if dirty is not None:
+            self._request_update(dirty)
 
     # ------------- view -------------
     def fit_to_content(self):
-        if not self.drawn_items: return
-        minx=miny= float("inf"); maxx=maxy= float("-inf")
-        for it in self.drawn_items:
-            if it['type']=='circle':
-                (cx,cy), r = it['points']
-                minx=min(minx, cx-r); maxx=max(maxx, cx+r)
-                miny=min(miny, cy-r); maxy=max(maxy, cy+r)
-            else:
-                for (x,y) in it['points']:
-                    minx=min(minx,x); maxx=max(maxx,x)
-                    miny=min(miny,y); maxy=max(maxy,y)
-        if minx==float("inf"): return
+        bb = self.scene_bbox()
+        if bb is None: return
+        minx, miny, maxx, maxy = bb
         pad = 0.1*max(maxx-minx, maxy-miny)
         minx-=pad; miny-=pad; maxx+=pad; maxy+=pad
         w=maxx-minx; h=maxy-miny
         if w==0 or h==0: return
         sx=(self.width()-40)/w; sy=(self.height()-40)/h
-        self.scale = max(0.1, min(1000.0, min(sx, sy)))
+        scale = max(0.1, min(1000.0, min(sx, sy)))
         cx=(minx+maxx)/2; cy=(miny+maxy)/2
-        self.offset_x = - (cx*self.scale)
-        self.offset_y =   (cy*self.scale)
+        view = (scale, -(cx*scale), cy*scale)
+        if view == (self.scale, self.offset_x, self.offset_y):
+            return  # already fitted: no repaint, no viewChanged
+        self.scale, self.offset_x, self.offset_y = view
         self.update()
         self.viewChanged.emit()
 
@@ -494,7 +1056,7 @@ class DXFCanvas(QWidget):
         for e in list(msp):
             msp.delete_entity(e)
         for it in self.drawn_items:
-            t=it['type']; pts=it['points']
+            t=it.type; pts=it.points
             if t=='line':
                 msp.add_line(pts[0], pts[1])
             elif t=='rectangle':
@@ -517,6 +1079,17 @@ class DXFEditorQt(QMainWindow):
         self.doc = None
         self.filename = None
         self.theme_colors = theme_colors or {}
+        self._load_worker = None
+        self._load_job = 0       # bumped per open/new; stale load results are dropped
+        self._load_name = None
+        self._save_worker = None
+        # Coordinate/scale readouts are refreshed at most once per ~16 ms
+        self._pending_xy = None
+        self._pending_view = False
+        self._label_timer = QTimer(self)
+        self._label_timer.setSingleShot(True)
+        self._label_timer.setInterval(16)
+        self._label_timer.timeout.connect(self._flush_labels)
         self._setup_ui()
 
     def _setup_ui(self):
@@ -575,12 +1148,16 @@ class DXFEditorQt(QMainWindow):
     def _setup_toolbar(self):
         tb = QToolBar("Main Toolbar"); tb.setIconSize(QSize(24,24)); self.addToolBar(tb)
 
-        # tool buttons
+        # tool buttons: an exclusive group keeps exactly one checked, with one
+        # idClicked connection for all of them
         self.tool_buttons = {}
-        for tid, label in [("select","Select"), ("line","Line"), ("circle","Circle"), ("rectangle","Rectangle"), ("polyline","Polyline")]:
-            btn = QToolButton(); btn.setText(label); btn.setCheckable(True)
-            btn.clicked.connect(lambda checked, t=tid: self.set_tool(t))
+        self._tool_ids = ["select", "line", "circle", "rectangle", "polyline"]
+        self._tool_group = QButtonGroup(self); self._tool_group.setExclusive(True)
+        for i, tid in enumerate(self._tool_ids):
+            btn = QToolButton(); btn.setText(tid.capitalize()); btn.setCheckable(True)
+            self._tool_group.addButton(btn, i)
             tb.addWidget(btn); self.tool_buttons[tid]=btn
+        self._tool_group.idClicked.connect(self._on_tool_id)
         self.tool_buttons["select"].setChecked(True)
 
         tb.addSeparator()
@@ -628,6 +1205,8 @@ class DXFEditorQt(QMainWindow):
         self.canvas = DXFCanvas()
         self.canvas.mouseMoved.connect(self.on_mouse_moved)
         self.canvas.itemSelected.connect(self.on_item_selected)
+        self.canvas.itemAdded.connect(self.on_item_added)
+        self.canvas.itemRemoved.connect(self.on_item_removed)
         self.canvas.viewChanged.connect(self.on_view_changed)
         
         # Apply theme colors to canvas
@@ -638,10 +1217,11 @@ class DXFEditorQt(QMainWindow):
         return panel
 
     # ----- tool selection -----
+    def _on_tool_id(self, i):
+        self.set_tool(self._tool_ids[i])
+
     def set_tool(self, tool_id):
-        for t, b in self.tool_buttons.items():
-            if t != tool_id:
-                b.setChecked(False)
+        self.tool_buttons[tool_id].setChecked(True)  # the group unchecks the rest
         self.canvas.current_tool = tool_id
         self.canvas._cancel_drawing()
         if tool_id == "select":
@@ -652,11 +1232,24 @@ class DXFEditorQt(QMainWindow):
 
     # ----- canvas signal handlers -----
     def on_mouse_moved(self, x, y):
-        self.coord_label.setText(f"X: {x:.3f}, Y: {y:.3f}")
+        self._pending_xy = (x, y)
+        if not self._label_timer.isActive():
+            self._label_timer.start()
+
+    def _flush_labels(self):
+        if self._pending_xy is not None:
+            x, y = self._pending_xy
+            self._pending_xy = None
+            self.coord_label.setText(f"X: {x:.3f}, Y: {y:.3f}")
+        if self._pending_view:
+            self._pending_view = False
+            s = self.canvas.scale
+            msg = f"Scale: {s:.2f}" if s >= 1 else f"Scale: 1:{1/s:.0f}"
+            self.status_bar.showMessage(msg)
 
     def on_item_selected(self, item):
         if item:
-            t=item['type']; pts=item['points']
+            t=item.type; pts=item.points
             if t=='line':
                 self.selection_label.setText(f"Line: ({pts[0][0]:.2f},{pts[0][1]:.2f}) → ({pts[1][0]:.2f},{pts[1][1]:.2f})")
             elif t=='circle':
@@ -665,14 +1258,32 @@ class DXFEditorQt(QMainWindow):
                 self.selection_label.setText(f"Rectangle: ({pts[0][0]:.2f},{pts[0][1]:.2f}) ↔ ({pts[1][0]:.2f},{pts[1][1]:.2f})")
             elif t=='polyline':
                 self.selection_label.setText(f"Polyline: {len(pts)} points")
-            self._refresh_entity_list()
         else:
             self.selection_label.setText("No selection")
 
+    def on_item_added(self, item):
+        # add_item appends, so the new entity is always the last row
+        lst = self.entity_list
+        lst.addItem(f"{lst.count()}: {item.type.capitalize()}")
+
+    def on_item_removed(self, item, row):
+        # Drop the row and renumber the ones after it; the rest stay as they are
+        lst = self.entity_list
+        lst.setUpdatesEnabled(False)
+        lst.blockSignals(True)
+        try:
+            lst.takeItem(row)
+            items = self.canvas.drawn_items
+            for i in range(row, lst.count()):
+                lst.item(i).setText(f"{i}: {items[i].type.capitalize()}")
+        finally:
+            lst.blockSignals(False)
+            lst.setUpdatesEnabled(True)
+
     def on_view_changed(self):
-        s = self.canvas.scale
-        msg = f"Scale: {s:.2f}" if s >= 1 else f"Scale: 1:{1/s:.0f}"
-        self.status_bar.showMessage(msg)
+        self._pending_view = True
+        if not self._label_timer.isActive():
+            self._label_timer.start()
 
     def on_entity_selected_list(self):
         sel = self.entity_list.selectedItems()
@@ -681,9 +1292,9 @@ class DXFEditorQt(QMainWindow):
         if 0 <= idx < len(self.canvas.drawn_items):
             self.canvas.clear_selection()
             it = self.canvas.drawn_items[idx]
-            it['selected'] = True
+            it.selected = True
             self.canvas.selected_item = it
-            self.canvas.update()
+            self.canvas.invalidate(it.bbox)
             self.on_item_selected(it)
 
     # ----- view toggles -----
@@ -692,7 +1303,7 @@ class DXFEditorQt(QMainWindow):
         self.canvas.show_grid = state
         if hasattr(self, 'act_grid'):
             self.act_grid.setChecked(state)
-        self.canvas.update()
+        self.canvas.invalidate()
 
     def toggle_snap(self):
         state = self.snap_check.isChecked()
@@ -715,20 +1326,26 @@ class DXFEditorQt(QMainWindow):
     # ----- entity ops -----
     def delete_selected(self):
         if self.canvas.selected_item:
-            self.canvas.drawn_items.remove(self.canvas.selected_item)
-            self.canvas.selected_item = None
-            self.canvas.update()
-            self._refresh_entity_list()
+            self.canvas.remove_item(self.canvas.selected_item)
             self.selection_label.setText("No selection")
 
     # ----- DXF ops -----
+    def _saving(self):
+        """True (and says so) while a save is still writing the current doc."""
+        if self._save_worker and self._save_worker.isRunning():
+            self.status_bar.showMessage("Still saving…")
+            return True
+        return False
+
     def new_dxf(self):
+        if self._saving(): return
+        # A load still running belongs to the document being replaced
+        self._load_job += 1
+        self.canvas.setEnabled(True)
         try:
             self.doc = ezdxf.new('R2010')
             self.filename = None
-            self.canvas.drawn_items = []
-            self.canvas.selected_item = None
-            self.canvas.update()
+            self.canvas.clear_items()
             self._refresh_entity_list()
             self._update_dxf_info()
             self.status_bar.showMessage("Created new DXF document")
@@ -736,17 +1353,50 @@ class DXFEditorQt(QMainWindow):
             QMessageBox.critical(self, "Error", f"Failed to create new DXF:\n{e}")
 
     def open_dxf(self):
+        if self._saving(): return
+        if self._load_worker and self._load_worker.isRunning():
+            self.status_bar.showMessage("Still loading the previous file…")
+            return
         path, _ = QFileDialog.getOpenFileName(self, "Open DXF File", "", "DXF Files (*.dxf);;All Files (*.*)")
         if not path: return
+        # Parse in the background; the editor stays responsive on big files,
+        # but the canvas takes no edits the loaded file would then replace
+        self._load_job += 1
+        self._load_name = os.path.basename(path)
+        self._load_worker = DXFLoadWorker(self._load_job, path)
+        self._load_worker.progress.connect(self._on_dxf_progress)
+        self._load_worker.loaded.connect(self._on_dxf_loaded)
+        self._load_worker.error.connect(self._on_dxf_load_failed)
+        self._load_worker.start()
+        self.canvas.setEnabled(False)
+        self.status_bar.showMessage(f"Loading {os.path.basename(path)}…")
+
+    def _on_dxf_progress(self, job, n):
+        if job == self._load_job:
+            self.status_bar.showMessage(f"Loading {self._load_name}… {n} entities")
+
+    def _on_dxf_load_failed(self, job, err):
+        if job != self._load_job:
+            return
+        self.canvas.setEnabled(True)
+        self.status_bar.showMessage(f"Failed to load {self._load_name}")
+        QMessageBox.critical(self, "Error", f"Failed to load DXF:\n{err}")
+
+    def _on_dxf_loaded(self, job, path, doc, entries):
+        if job != self._load_job:
+            return
+        self.canvas.setEnabled(True)
         try:
-            self.doc = ezdxf.readfile(path)
+            self.doc = doc
             self.filename = path
-            self._import_doc_entities()
+            self._import_doc_entities(entries)
             self._refresh_entity_list()
             self._update_dxf_info()
             self.canvas.fit_to_content()
+            self._flush_labels()  # so the pending scale readout doesn't replace the message below
             self.status_bar.showMessage(f"Loaded: {os.path.basename(path)}")
         except Exception as e:
+            self.status_bar.showMessage(f"Failed to load {os.path.basename(path)}")
             QMessageBox.critical(self, "Error", f"Failed to load DXF:\n{e}")
 
     def save_dxf(self):
@@ -755,93 +1405,95 @@ class DXFEditorQt(QMainWindow):
             return
         if not self.filename:
             self.save_as_dxf(); return
-        try:
-            self.canvas.export_to_doc(self.doc)
-            self.doc.saveas(self.filename)
-            self.status_bar.showMessage(f"Saved: {self.filename}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save DXF:\n{e}")
+        self._start_save(self.filename)
 
     def save_as_dxf(self):
         if not self.doc:
             QMessageBox.warning(self, "Warning", "No DXF document to save")
             return
+        if self._saving(): return
         path, _ = QFileDialog.getSaveFileName(self, "Save DXF File", "", "DXF Files (*.dxf);;All Files (*.*)")
         if not path: return
+        self._start_save(path)
+
+    def _start_save(self, path):
+        if self._saving(): return
+        # Copy the canvas into the doc here (fast, touches GUI state); only the
+        # slow serialisation to disk runs on the worker thread
         try:
             self.canvas.export_to_doc(self.doc)
-            self.doc.saveas(path)
-            self.filename = path
-            self.status_bar.showMessage(f"Saved: {path}")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save DXF:\n{e}")
+            return
+        self._save_worker = DXFSaveWorker(self.doc, path)
+        self._save_worker.saved.connect(self._on_dxf_saved)
+        self._save_worker.error.connect(
+            lambda e: QMessageBox.critical(self, "Error", f"Failed to save DXF:\n{e}"))
+        self._save_worker.start()
+        self.status_bar.showMessage(f"Saving {os.path.basename(path)}…")
+
+    def _on_dxf_saved(self, path, doc):
+        # The path only names the document that was written
+        if doc is self.doc:
+            self.filename = path
+        self.status_bar.showMessage(f"Saved: {path}")
+
+    def closeEvent(self, event):
+        # Let a running save finish: destroying it mid-write would abort the
+        # process and leave a half-written file
+        if self._save_worker and self._save_worker.isRunning():
+            self.status_bar.showMessage("Finishing save…")
+            self._save_worker.wait()
+        # A load has nothing to keep, but its thread must not outlive the window
+        if self._load_worker and self._load_worker.isRunning():
+            self._load_worker.wait()
+        super().closeEvent(event)
 
     def print_dxf(self):
         if not self.doc:
             QMessageBox.information(self, "Print", "Nothing to print.")
             return
+        from PyQt6.QtPrintSupport import QPrintDialog, QPrinter
         printer = QPrinter(QPrinter.PrinterMode.HighResolution)
         dlg = QPrintDialog(printer, self)
         if dlg.exec() == QPrintDialog.DialogCode.Accepted:
-            # Simple print: render canvas
-            # (For CAD-accurate printing, export to vector/pdf; this keeps parity with your UI.)
-            from PyQt6.QtGui import QPixmap
-            pm = QPixmap(self.canvas.size())
-            self.canvas.render(pm)
+            # Print the current view as vectors: the canvas paints straight onto
+            # the printer, its widget rect mapped onto the page
             painter = QPainter(printer)
             rect = painter.viewport()
-            size = pm.size()
+            size = self.canvas.size()
             size.scale(rect.size(), Qt.AspectRatioMode.KeepAspectRatio)
             painter.setViewport(rect.x(), rect.y(), size.width(), size.height())
-            painter.setWindow(pm.rect())
-            painter.drawPixmap(0, 0, pm)
+            painter.setWindow(self.canvas.rect())
+            self.canvas.render_scene(painter)
             painter.end()
 
-    def _import_doc_entities(self):
-        self.canvas.drawn_items = []
+    def _import_doc_entities(self, entries=None):
+        self.canvas.clear_items()
         if not self.doc: return
-        msp = self.doc.modelspace()
-        for e in msp:
-            try:
-                t = e.dxftype()
-                if t == 'LINE':
-                    s, t_ = e.dxf.start, e.dxf.end
-                    self.canvas.add_item('line', [(s.x, s.y), (t_.x, t_.y)])
-                elif t == 'CIRCLE':
-                    c = e.dxf.center; r = e.dxf.radius
-                    self.canvas.add_item('circle', [(c.x, c.y), r])
-                elif t in ('LWPOLYLINE', 'POLYLINE'):
-                    pts=[]
-                    try:
-                        for pt in e.get_points():
-                            pts.append((pt[0], pt[1]))
-                    except Exception:
-                        try:
-                            for v in e.vertices():
-                                loc=v.dxf.location; pts.append((loc.x, loc.y))
-                        except Exception:
-                            pass
-                    if pts:
-                        if t=='LWPOLYLINE' and getattr(e, 'closed', False):
-                            pts.append(pts[0])
-                        self.canvas.add_item('polyline', pts)
-            except Exception:
-                continue
-        self.canvas.update()
+        # One batch for the canvas: a single index build and repaint
+        self.canvas.add_items(doc_entries(self.doc) if entries is None else entries)
 
     def _refresh_entity_list(self):
-        self.entity_list.clear()
-        for i, it in enumerate(self.canvas.drawn_items):
-            self.entity_list.addItem(QListWidgetItem(f"{i}: {it['type'].capitalize()}"))
+        # One addItems() call with signals and repaints held off until the end
+        lst = self.entity_list
+        lst.setUpdatesEnabled(False)
+        lst.blockSignals(True)
+        try:
+            lst.clear()
+            lst.addItems([f"{i}: {it.type.capitalize()}" for i, it in enumerate(self.canvas.drawn_items)])
+        finally:
+            lst.blockSignals(False)
+            lst.setUpdatesEnabled(True)
 
     def _update_dxf_info(self):
         if not self.doc:
             self.dxf_info_label.setText("No DXF loaded"); return
-        ents = list(self.doc.modelspace())
+        n_ents = len(self.doc.modelspace())
         info = (f"DXF Information:\n"
                 f"File: {self.filename or 'Unsaved'}\n"
                 f"Version: {self.doc.dxfversion}\n"
-                f"Entities: {len(ents)}\n"
+                f"Entities: {n_ents}\n"
                 f"Layers: {len(self.doc.layers)}")
         self.dxf_info_label.setText(info)
 
@@ -4,10 +4,13 @@ CNC Engrave Suite – CNC Suite Edition
 Brian Wilson (Grump) and AI. Inspired by scorchworks
 """
 
-import sys, os, math
+import sys, os, math, io
+from collections import OrderedDict
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from PyQt6.QtCore import Qt
+import numpy as np
+
+from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
 from PyQt6.QtGui import (
     QColor, QPen, QPainter, QFontDatabase, QFont, QTransform, QPainterPath,
     QImage, QPixmap
@@ -29,7 +32,6 @@ except Exception:
 # Optional image processing
 try:
     import cv2
-    import numpy as np
     IMAGE_PROCESSING_AVAILABLE = True
 except Exception:
     IMAGE_PROCESSING_AVAILABLE = False
@@ -76,9 +78,63 @@ class ZoomableGraphicsView(QGraphicsView):
         super().mouseReleaseEvent(e)
 
 
+# ---------- Polyline Simplify ----------
+def rdp_mask(pts, eps):
+    """Douglas-Peucker keep-mask for an (N, 2) polyline.
+
+    Iterative (explicit stack) and compares squared distances, so no sqrt per
+    point; each span's farthest point is found with one NumPy pass.
+    """
+    n = len(pts)
+    keep = np.ones(n, dtype=bool)
+    if n < 3 or eps <= 0:
+        return keep
+    keep[1:-1] = False
+    eps_sq = eps * eps
+    stack = [(0, n - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        rel = pts[a + 1:b] - pts[a]
+        dx, dy = pts[b] - pts[a]
+        l2 = dx * dx + dy * dy
+        if l2 > 0:
+            cross = rel[:, 0] * dy - rel[:, 1] * dx
+            d2 = cross * cross / l2
+        else:  # closed run: measure from the shared end point
+            d2 = (rel * rel).sum(1)
+        i = int(d2.argmax())
+        if d2[i] > eps_sq:
+            k = a + 1 + i
+            keep[k] = True
+            stack.append((a, k))
+            stack.append((k, b))
+    return keep
+
+
+# ---------- Font Scan ----------
+class FontScanWorker(QThread):
+    """Lists the .ttf/.otf files of a font folder off the GUI thread."""
+    found = pyqtSignal(object)   # sorted file names, or None without a readable folder
+
+    def __init__(self, font_dir: str):
+        super().__init__()
+        self._font_dir = font_dir
+
+    def run(self):
+        try:
+            names = os.listdir(self._font_dir)
+        except OSError:
+            self.found.emit(None)
+            return
+        self.found.emit(sorted(f for f in names if f.lower().endswith((".ttf", ".otf"))))
+
+
 # ---------- Main ----------
 class CNCEngraveApp(QMainWindow):
     FONT_DIR = "fonts"
+    LAYOUT_CACHE_SIZE = 8
 
     def __init__(self, colors):
         super().__init__()
@@ -90,8 +146,23 @@ class CNCEngraveApp(QMainWindow):
         self.view = ZoomableGraphicsView(colors, self.scene)
         self.path = None
         self.vector_paths = []
+        self.vector_polys = []   # (K, 2) float32 outline per vector path, for export
         self.current_image = None
+        self._blurred = None
+        self._contours = None  # ((threshold, retrieval mode), [(contour, arc length), ...])
         self.image_path = None
+        self._font_files = None       # cached font folder listing
+        self._font_worker = None
+        self._font_family_cache = {}  # font file -> registered Qt family
+        self._glyph_cache = {}        # (font key, char) -> outline at origin
+        self._layout_cache = OrderedDict()  # layout inputs -> laid-out text path (LRU)
+        self._subpath_cache = {}      # id(path) -> (path, [(N, 2) subpath arrays])
+
+        # Slider drags re-vectorize once they pause, not on every tick
+        self._vec_timer = QTimer(self)
+        self._vec_timer.setSingleShot(True)
+        self._vec_timer.setInterval(80)
+        self._vec_timer.timeout.connect(self.vectorize_image)
 
         self.init_ui()
 
@@ -140,13 +211,18 @@ class CNCEngraveApp(QMainWindow):
         grid.addWidget(QLabel("Simplify:"), r, 0)
         grid.addWidget(self.simplify_slider, r, 1); r += 1
 
+        self.holes_chk = QCheckBox("Trace Holes")
+        self.holes_chk.setChecked(True)
+        grid.addWidget(self.holes_chk, r, 0, 1, 2); r += 1
+
         self.vectorize_btn = QPushButton("Vectorize Image")
         self.vectorize_btn.clicked.connect(self.vectorize_image)
         grid.addWidget(self.vectorize_btn, r, 0, 1, 2); r += 1
 
         # Live preview updates
-        self.threshold_slider.valueChanged.connect(self.vectorize_image)
-        self.simplify_slider.valueChanged.connect(self.vectorize_image)
+        self.threshold_slider.valueChanged.connect(lambda _: self._vec_timer.start())
+        self.simplify_slider.valueChanged.connect(lambda _: self._vec_timer.start())
+        self.holes_chk.toggled.connect(lambda _: self._vec_timer.start())
 
         # --- Text Geometry ---
         grid.addWidget(QLabel("<b>Text Geometry</b>"), r, 0, 1, 2); r += 1
@@ -199,6 +275,7 @@ class CNCEngraveApp(QMainWindow):
         self.depth = spinr("Total Depth (mm)", -1, (-50, 0), 0.1)
         self.step = spinr("Step Depth (mm)", -0.3, (-10, 0), 0.1)
         self.safez = spinr("Safe Z (mm)", 5, (0, 100), 1)
+        self.gcode_simplify = spinr("G-code Simplify (mm)", 0, (0, 10), 0.01)
         self.laser = QCheckBox("Laser Mode (M3/M5)")
         rg.addWidget(self.laser, rr, 0, 1, 2); rr += 1
 
@@ -270,62 +347,96 @@ class CNCEngraveApp(QMainWindow):
             QMessageBox.warning(self, "Error", "Could not load image.")
             return
         self.current_image = img
+        # Threshold/simplify changes only re-run Canny onwards
+        self._blurred = cv2.GaussianBlur(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        self._contours = None
         self.image_path = fn
         self.scene.clear()
-        self.scene.addPixmap(QPixmap.fromImage(QImage(fn)))
+        # Show the array cv2 already decoded (BGR rows) rather than decoding the file again
+        h, w = img.shape[:2]
+        qimg = QImage(img.data, w, h, img.strides[0], QImage.Format.Format_BGR888)
+        self.scene.addPixmap(QPixmap.fromImage(qimg))
         self.view.fitInView(self.scene.itemsBoundingRect(), Qt.AspectRatioMode.KeepAspectRatio)
         self.status.showMessage(f"Image loaded: {os.path.basename(fn)}")
 
     def vectorize_image(self):
+        self._vec_timer.stop()
         if not IMAGE_PROCESSING_AVAILABLE or self.current_image is None:
             return
-        gray = cv2.cvtColor(self.current_image, cv2.COLOR_BGR2GRAY)
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
         thr = self.threshold_slider.value()
-        edges = cv2.Canny(blurred, thr / 2, thr)
-        contours, _ = cv2.findContours(edges, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        mode = cv2.RETR_TREE if self.holes_chk.isChecked() else cv2.RETR_EXTERNAL
+        if self._contours is None or self._contours[0] != (thr, mode):
+            # Simplify-only changes reuse these; tiny contours are dropped up front
+            edges = cv2.Canny(self._blurred, thr / 2, thr)
+            found, _ = cv2.findContours(edges, mode, cv2.CHAIN_APPROX_SIMPLE)
+            areas = np.fromiter((cv2.contourArea(c) for c in found), dtype=np.float32, count=len(found))
+            kept = [(c, cv2.arcLength(c, True)) for c, big in zip(found, areas >= 10) if big]
+            self._contours = ((thr, mode), kept)
+        contours = self._contours[1]
         self.scene.clear()
         self.vector_paths = []
+        self.vector_polys = []
+        self._subpath_cache.clear()
         if not contours:
             self.status.showMessage("No contours found.")
             return
-        max_dim = max(self.current_image.shape[:2])
+        h, w = self.current_image.shape[:2]
+        max_dim = max(h, w)
         scale = 200.0 / max_dim if max_dim else 1.0
-        for contour in contours:
-            if cv2.contourArea(contour) < 10:
-                continue
-            eps = (self.simplify_slider.value() / 1000.0) * cv2.arcLength(contour, True)
-            contour = cv2.approxPolyDP(contour, eps, True)
+        center = np.array([w / 2, h / 2], dtype=np.float32)
+        frac = self.simplify_slider.value() / 1000.0
+        combined = QPainterPath()  # every outline in one scene item
+        for contour, arclen in contours:
+            contour = cv2.approxPolyDP(contour, frac * arclen, True)
+            # Centre and scale the whole contour at once, then hand Qt plain floats
+            arr = (contour.reshape(-1, 2).astype(np.float32) - center) * scale
+            arr = arr[np.r_[True, (arr[1:] != arr[:-1]).any(1)]]  # Qt drops zero-length lines
+            xs, ys = arr[:, 0].tolist(), arr[:, 1].tolist()
             path = QPainterPath()
-            p0 = contour[0][0]
-            path.moveTo((p0[0] - self.current_image.shape[1]/2)*scale,
-                        (p0[1] - self.current_image.shape[0]/2)*scale)
-            for pt in contour[1:]:
-                x = (pt[0][0] - self.current_image.shape[1]/2)*scale
-                y = (pt[0][1] - self.current_image.shape[0]/2)*scale
+            path.moveTo(xs[0], ys[0])
+            for x, y in zip(xs[1:], ys[1:]):
                 path.lineTo(x, y)
             path.closeSubpath()
             self.vector_paths.append(path)
+            # Same outline as closeSubpath() leaves it, so exports skip the Qt walk
+            if len(arr) > 1 and (arr[0] != arr[-1]).any():
+                arr = np.vstack((arr, arr[:1]))
+            self.vector_polys.append(arr)
+            combined.addPath(path)
+        if self.vector_paths:
             pen = QPen(QColor(self.colors["accent"]))
             pen.setWidthF(0.4)
-            self.scene.addPath(path, pen)
-        if self.vector_paths:
-            combined = QPainterPath()
-            for p in self.vector_paths:
-                combined.addPath(p)
+            self.scene.addPath(combined, pen)
             self.view.fitInView(combined.boundingRect(), Qt.AspectRatioMode.KeepAspectRatio)
             self.status.showMessage(f"Vectorized {len(self.vector_paths)} paths.")
 
     # ---- Font & Text ----
     def populate_fonts(self):
+        if self._font_files is None:
+            # First call: scan the folder in the background and come back here
+            if self._font_worker is None:
+                self.fonts.clear()
+                self.fonts.addItem("(loading fonts…)")
+                self._font_worker = FontScanWorker(self.FONT_DIR)
+                self._font_worker.found.connect(self._on_fonts_found)
+                self._font_worker.start()
+            return
         self.fonts.clear()
-        font_dir = self.FONT_DIR
-        if not os.path.isdir(font_dir):
+        self.fonts.addItems(self._font_files or ["(no fonts found)"])
+
+    def _on_fonts_found(self, files):
+        if files is None:
+            self.fonts.clear()
             self.fonts.addItem("(no fonts folder)")
             return
-        fonts = [f for f in os.listdir(font_dir) if f.lower().endswith((".ttf", ".otf"))]
-        fonts.sort()
-        self.fonts.addItems(fonts or ["(no fonts found)"])
+        self._font_files = files
+        self.populate_fonts()
+
+    def closeEvent(self, e):
+        # The window may be deleted on close (launcher); its thread must not outlive it
+        if self._font_worker is not None:
+            self._font_worker.wait()
+        super().closeEvent(e)
 
     def preview_text(self):
         text = self.text_input.text().strip()
@@ -335,15 +446,29 @@ class CNCEngraveApp(QMainWindow):
         if not os.path.isfile(fontfile):
             self.status.showMessage("Font file not found.")
             return
-        fid = QFontDatabase.addApplicationFont(fontfile)
-        fams = QFontDatabase.applicationFontFamilies(fid)
-        if not fams:
-            self.status.showMessage("Could not load font.")
-            return
-        fam = fams[0]
+        fam = self._font_family_cache.get(fontfile)
+        if fam is None:
+            fid = QFontDatabase.addApplicationFont(fontfile)
+            fams = QFontDatabase.applicationFontFamilies(fid)
+            if not fams:
+                self.status.showMessage("Could not load font.")
+                return
+            fam = self._font_family_cache[fontfile] = fams[0]
         font = QFont(fam, int(self.text_height.value()))
         font.setLetterSpacing(QFont.SpacingType.PercentageSpacing, self.char_space.value())
-        path = self.layout_text(text, font)
+        # Pen width and G-code settings don't change the geometry: reuse the layout
+        key = (text, font.key(), self.justify.currentText(), self.radius.value(),
+               self.diameter_mode.isChecked(), self.line_spacing.value(),
+               self.char_space.value(), self.text_angle.value())
+        path = self._layout_cache.get(key)
+        if path is None:
+            path = self._layout_cache[key] = self.layout_text(text, font)
+            if len(self._layout_cache) > self.LAYOUT_CACHE_SIZE:
+                self._layout_cache.popitem(last=False)
+        else:
+            self._layout_cache.move_to_end(key)
+        if path is not self.path:
+            self._subpath_cache.clear()
         self.path = path
         self.scene.clear()
         pen = QPen(QColor(self.colors["text"]))
@@ -353,6 +478,16 @@ class CNCEngraveApp(QMainWindow):
         self.view.fitInView(br, Qt.AspectRatioMode.KeepAspectRatio)
         self.status.showMessage("Preview updated.")
 
+    def _glyph(self, font, ch):
+        """Outline of one character at the origin, built once per font."""
+        key = (font.key(), ch)
+        p = self._glyph_cache.get(key)
+        if p is None:
+            p = QPainterPath()
+            p.addText(0, 0, font, ch)
+            self._glyph_cache[key] = p
+        return p
+
     def layout_text(self, text, font):
         path = QPainterPath()
         justify = self.justify.currentText()
@@ -363,33 +498,20 @@ class CNCEngraveApp(QMainWindow):
         y = 0
         for line in lines:
             if justify == "Circle" and abs(radius) > 1e-3 and len(line) > 0:
-                ang_step = 360 / len(line)
+                # rotate(a) . translate(0, -r) . rotate(-a) is just a shift by
+                # (r sin a, -r cos a): glyphs stay upright around the circle
+                ang_step = -2 * math.pi / len(line)
                 for i, ch in enumerate(line):
-                    chpath = QPainterPath()
-                    chpath.addText(0, 0, font, ch)
-                    angle = -ang_step * i
-                    tr = QTransform()
-                    tr.rotate(angle)
-                    tr.translate(0, -radius)
-                    tr.rotate(-angle)
-                    path.addPath(tr.map(chpath))
+                    a = ang_step * i
+                    path.addPath(self._glyph(font, ch).translated(radius * math.sin(a), -radius * math.cos(a)))
             elif justify == "Diameter" and abs(radius) > 1e-3:
-                line_path = QPainterPath()
-                total_width = 0
-                char_paths = []
-                for ch in line:
-                    ch_path = QPainterPath()
-                    ch_path.addText(0, 0, font, ch)
-                    char_paths.append(ch_path)
-                    total_width += ch_path.boundingRect().width() * (self.char_space.value() / 100.0)
-                current_x = -total_width / 2
-                for ch_path in char_paths:
-                    char_width = ch_path.boundingRect().width() * (self.char_space.value() / 100.0)
-                    tr = QTransform()
-                    tr.translate(current_x + char_width / 2, 0)
-                    line_path.addPath(tr.map(ch_path))
+                spacing = self.char_space.value() / 100.0
+                char_paths = [self._glyph(font, ch) for ch in line]
+                widths = [ch_path.boundingRect().width() * spacing for ch_path in char_paths]
+                current_x = -sum(widths) / 2
+                for ch_path, char_width in zip(char_paths, widths):
+                    path.addPath(ch_path.translated(current_x + char_width / 2, 0))
                     current_x += char_width
-                path.addPath(line_path)
             else:
                 lp = QPainterPath()
                 lp.addText(0, 0, font, line)
@@ -406,59 +528,105 @@ class CNCEngraveApp(QMainWindow):
         tr.rotate(self.text_angle.value())
         return tr.map(path)
 
+    # ---- Path data ----
+    def _path_polys(self, qpath):
+        """qpath's subpaths as (N, 2) float64 arrays, curves flattened; built once per path."""
+        hit = self._subpath_cache.get(id(qpath))
+        if hit is not None and hit[0] is qpath:
+            return hit[1]
+        out = []
+        # One call into Qt for all subpaths, then read each QPolygonF's points in place
+        for poly in qpath.toSubpathPolygons(QTransform()):
+            n = len(poly)
+            if n:
+                buf = poly.data()
+                buf.setsize(n * 16)  # QPointF: two doubles
+                out.append(np.frombuffer(buf, dtype=np.float64).reshape(n, 2).copy())
+        self._subpath_cache[id(qpath)] = (qpath, out)
+        return out
+
+    def _subpaths(self, paths):
+        """Yield every subpath of paths (QPainterPaths or outline arrays) as an (N, 2) array."""
+        for item in paths:
+            if isinstance(item, np.ndarray):
+                yield item
+            else:
+                yield from self._path_polys(item)
+
+    def _export_polys(self):
+        """(K, 2) point arrays to export: the vector outlines, else the text path's subpaths."""
+        if self.vector_paths:
+            return self.vector_polys
+        return self._path_polys(self.path)
+
     # ---- G-code ----
-    def path_to_gcode(self, path: QPainterPath):
-        if not path or path.isEmpty():
-            return ""
+    def path_to_gcode(self, path):
+        """G-code text for path; see _emit_gcode()."""
+        out = io.StringIO()
+        self._emit_gcode(path, out)
+        return out.getvalue()
+
+    def _emit_gcode(self, path, out):
+        """Write G-code for a QPainterPath, or a list of QPainterPaths or (K, 2) outlines, to out."""
+        paths = [path] if isinstance(path, QPainterPath) else path
+        if not paths or all(isinstance(p, QPainterPath) and p.isEmpty() for p in paths):
+            return
         feed = self.feed.value()
         depth = self.depth.value()
         step = self.step.value()
         safe = self.safez.value()
         passes = max(1, int(abs(depth / step))) if step != 0 else 1
-        g = ["(CNC Engrave)", "G21 G90"]
+        feed_suffix = " F%.1f" % feed
+        cut = "G1 X%.3f Y%.3f" + feed_suffix + "\n"
+        retract = "G0 Z%.3f\n" % safe
+        tol = self.gcode_simplify.value()
+        # Format each subpath once, as its rapid and its block of cuts; every
+        # pass replays them around its own plunge line
+        runs = []
+        for run in self._subpaths(paths):
+            if tol > 0:
+                run = run[rdp_mask(run, tol)]
+            # All cut lines of the run in one %-format call over the flat coordinates
+            runs.append(("G0 X%.3f Y%.3f\n" % tuple(run[0].tolist()),
+                         cut * (len(run) - 1) % tuple(run[1:].ravel().tolist())))
+        write = out.write
+        write("(CNC Engrave)\nG21 G90\n")
         if self.laser.isChecked():
-            g.append("M3 (Laser On)")
-        g.append(f"G0 Z{safe:.3f}")
+            write("M3 (Laser On)\n")
+        write(retract)
         for p in range(passes):
             z = max(step * (p + 1), depth)
-            g.append(f"(Pass {p + 1}/{passes} Z={z:.3f})")
-            started = False
-            for i in range(path.elementCount()):
-                el = path.elementAt(i)
-                if i == 0 or el.isMoveTo():
-                    if started:
-                        g.append(f"G0 Z{safe:.3f}")
-                    g.append(f"G0 X{el.x:.3f} Y{el.y:.3f}")
-                    g.append(f"G1 Z{z:.3f} F{feed:.1f}")
-                    started = True
-                elif el.isLineTo():
-                    g.append(f"G1 X{el.x:.3f} Y{el.y:.3f} F{feed:.1f}")
-            g.append(f"G0 Z{safe:.3f}")
+            write("(Pass %d/%d Z=%.3f)\n" % (p + 1, passes, z))
+            plunge = "G1 Z%.3f%s\n" % (z, feed_suffix)
+            for i, (rapid, cuts) in enumerate(runs):
+                if i:
+                    write(retract)
+                write(rapid)
+                write(plunge)
+                write(cuts)
+            write(retract)
         if self.laser.isChecked():
-            g.append("M5 (Laser Off)")
-        g.append(f"G0 Z{safe:.3f}")
-        g.append("M30")
-        return "\n".join(g)
+            write("M5 (Laser Off)\n")
+        write(retract)
+        write("M30")
 
     def export_gcode(self):
         try:
             if self.vector_paths:
-                combined_path = QPainterPath()
-                for p in self.vector_paths:
-                    combined_path.addPath(p)
-                gcode = self.path_to_gcode(combined_path)
+                source = self.vector_polys
             else:
                 if not self.path:
                     QMessageBox.warning(self, "No Preview", "Preview text or vectorize image first.")
                     return
-                gcode = self.path_to_gcode(self.path)
+                source = self.path
 
             fn, _ = QFileDialog.getSaveFileName(self, "Save G-Code", "engrave_output.nc",
                                                 "G-Code Files (*.nc *.gcode);;All Files (*)")
             if not fn:
                 return
-            with open(fn, "w") as f:
-                f.write(gcode)
+            # Stream straight into a 1 MB write buffer rather than building the file in memory
+            with open(fn, "w", buffering=1 << 20) as f:
+                self._emit_gcode(source, f)
             self.status.showMessage(f"G-code saved: {fn}")
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
@@ -477,15 +645,9 @@ class CNCEngraveApp(QMainWindow):
         try:
             doc = ezdxf.new('R2010')
             msp = doc.modelspace()
-            paths = self.vector_paths if self.vector_paths else [self.path]
-            for qpath in paths:
-                pts = []
-                for i in range(qpath.elementCount()):
-                    el = qpath.elementAt(i)
-                    if el.isMoveTo() or el.isLineTo():
-                        pts.append((el.x, el.y))
-                if len(pts) >= 2:
-                    msp.add_lwpolyline(pts)
+            for arr in self._export_polys():
+                if len(arr) >= 2:
+                    msp.add_lwpolyline(arr.tolist())
             doc.saveas(fn)
             self.status.showMessage(f"DXF saved: {fn}")
         except Exception as e:
@@ -499,31 +661,23 @@ class CNCEngraveApp(QMainWindow):
         if not fn:
             return
         try:
-            paths = self.vector_paths if self.vector_paths else [self.path]
+            polys = self._export_polys()
             # simple SVG writer for polylines
             def svg_escape(s): return s.replace("&","&amp;").replace("<","&lt;").replace(">","&gt;")
-            minx=miny= float("inf"); maxx=maxy= float("-inf")
-            polylines=[]
-            for qpath in paths:
-                pts=[]
-                for i in range(qpath.elementCount()):
-                    el=qpath.elementAt(i)
-                    if el.isMoveTo() or el.isLineTo():
-                        pts.append((el.x, el.y))
-                        minx=min(minx, el.x); maxx=max(maxx, el.x)
-                        miny=min(miny, el.y); maxy=max(maxy, el.y)
-                if len(pts)>=2:
-                    polylines.append(pts)
-            if minx==float("inf"):
+            if not polys:
                 QMessageBox.warning(self,"Empty","Nothing to export.")
                 return
+            # Bounds in two vectorised reductions over one contiguous buffer
+            arr=np.vstack(polys)
+            (minx, miny), (maxx, maxy) = arr.min(0).tolist(), arr.max(0).tolist()
             width=maxx-minx or 1; height=maxy-miny or 1
+            # Only the stroke needs escaping; the points are plain numbers
+            head=f'<polyline fill="none" stroke="{svg_escape(self.colors["accent"])}" stroke-width="0.3" points="'
             with open(fn,"w") as f:
                 f.write(f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{minx} {miny} {width} {height}">')
-                stroke=self.colors["accent"]
-                for pts in polylines:
-                    d=" ".join(f"{x},{y}" for x,y in pts)
-                    f.write(f'<polyline fill="none" stroke="{svg_escape(stroke)}" stroke-width="0.3" points="{svg_escape(d)}" />')
+                for a in polys:
+                    if len(a)>=2:
+                        f.write(head + " ".join(f"{x},{y}" for x,y in a.tolist()) + '" />')
                 f.write("</svg>")
             self.status.showMessage(f"SVG saved: {fn}")
         except Exception as e:
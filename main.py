@@ -9,6 +9,8 @@ import sys
 import os
 import json
 import subprocess
+import traceback
+import importlib.util
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton,
     QGridLayout, QMessageBox, QComboBox, QCheckBox, QHBoxLayout
@@ -23,16 +25,19 @@ from themes.theme_utils import apply_theme
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.json")
 TOOLS_PATH = os.path.join(os.path.dirname(__file__), "tools")
 
+# (button label, file in tools/, main window class, constructor takes theme colours)
+# A tool without a window class always runs as its own process.
 TOOLS = [
-    ("Depth Map", "depthmap.py"),
-    ("DXF Editor", "dxf.py"),
-    ("GCode Viewer", "Gcode_viewer.py"),
-    ("Pic2Laser", "pic2laser.py"),
-    ("Pic23D", "pic23d.py"),
-    ("GCode Sender", "sender.py"),
-    ("STL Slicer", "slicer.py"),
-    ("STL Viewer", "stl_viewer.py"),
-    ("Text Engrave", "engrave.py"),
+    ("Depth Map", "depthmap.py", "CNCDepthMapGeneratorQt", True),
+    ("DXF Editor", "dxf.py", "DXFEditorQt", True),
+    ("GCode Viewer", "Gcode_viewer.py", "GcodeViewer", False),
+    ("Pic2Laser", "pic2laser.py", "Pic2LaserApp", True),
+    ("Pic23D", "pic23d.py", "Pic23DApp", False),
+    # The sender owns the serial port: closing it must end the stream
+    ("GCode Sender", "sender.py", None, False),
+    ("STL Slicer", "slicer.py", "SlicerApp", False),
+    ("STL Viewer", "stl_viewer.py", "STL3DViewer", False),
+    ("Text Engrave", "engrave.py", "CNCEngraveApp", True),
 ]
 
 
@@ -70,6 +75,8 @@ class MainWindow(QMainWindow):
         cfg = load_config()
         self.theme_mode = cfg.get("theme", "dark")
         self.color_mode = cfg.get("color", "grey")
+        self._tool_modules = {}      # tool path -> imported module
+        self._open_windows = set()   # in-process tool windows, kept alive until closed
 
         # Apply palette
         apply_theme(QApplication.instance(), self.theme_mode, self.color_mode)
@@ -89,10 +96,10 @@ class MainWindow(QMainWindow):
         layout.addLayout(grid)
 
         row = col = 0
-        for name, filename in TOOLS:
+        for name, filename, entry, wants_colors in TOOLS:
             btn = QPushButton(name)
             btn.setMinimumHeight(42)
-            btn.clicked.connect(lambda checked, f=filename: self.launch_tool(f))
+            btn.clicked.connect(lambda checked, t=(filename, entry, wants_colors): self.launch_tool(*t))
             grid.addWidget(btn, row, col)
             col += 1
             if col > 2:
@@ -134,14 +141,24 @@ class MainWindow(QMainWindow):
         save_config({"theme": self.theme_mode, "color": self.color_mode})
 
     # -------------------------------
-    # Launch external tool
+    # Launch tool
     # -------------------------------
-    def launch_tool(self, filename):
+    def launch_tool(self, filename, entry=None, wants_colors=False):
         path = os.path.join(TOOLS_PATH, filename)
         if not os.path.exists(path):
             QMessageBox.warning(self, "Missing File", f"{filename} not found in /tools/")
             return
 
+        # Open the tool's window in this process: no interpreter start-up and
+        # no second PyQt load. Anything that goes wrong falls back to a process,
+        # including a tool that calls sys.exit() at import (dxf.py without ezdxf).
+        if entry:
+            try:
+                self._open_in_process(path, entry, wants_colors)
+                return
+            except (Exception, SystemExit):
+                pass
+
         try:
             subprocess.Popen([
                 sys.executable,
@@ -152,8 +169,34 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
 
+    def _open_in_process(self, path, entry, wants_colors):
+        mod = self._tool_modules.get(path)
+        if mod is None:
+            name = "cnc_tool_" + os.path.splitext(os.path.basename(path))[0].lower()
+            spec = importlib.util.spec_from_file_location(name, path)
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)
+            self._tool_modules[path] = mod
+        cls = getattr(mod, entry)
+        if wants_colors:
+            colors = apply_theme(QApplication.instance(), self.theme_mode, self.color_mode)
+            win = cls(colors)
+        else:
+            win = cls()
+        win.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self._open_windows.add(win)
+        win.destroyed.connect(lambda _=None, w=win: self._open_windows.discard(w))
+        win.show()
+
+
+def _report_error(*exc_info):
+    # With the default hook PyQt aborts the process on an uncaught slot error,
+    # taking the launcher and every in-process tool window down with it
+    traceback.print_exception(*exc_info)
+
 
 def main():
+    sys.excepthook = _report_error
     app = QApplication(sys.argv)
     cfg = load_config()
     apply_theme(app, cfg.get("theme", "dark"), cfg.get("color", "grey"))
@@ -66,6 +66,7 @@ class Pic23DApp(QMainWindow):
         self.resize(1400, 900)
         self.Z = None
         self.image_path = None
+        self._grid = None  # (scale key, X axis, Y axis, scaled Z)
         self._init_ui()
 
     def _init_ui(self):
@@ -123,24 +124,35 @@ class Pic23DApp(QMainWindow):
         try:
             self.image_path = path
             img = Image.open(path).convert("L")
-            self.Z = np.array(img, dtype=float)
+            self.Z = np.asarray(img)  # uint8; scaled to float in _scaled_grid()
+            self._grid = None
             self.statusBar().showMessage(
                 f"Loaded: {os.path.basename(path)} ({self.Z.shape[1]}x{self.Z.shape[0]})"
             )
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Image load failed: {e}")
 
+    def _scaled_grid(self):
+        """X and Y axes and the scaled height field, shared by preview and STL export."""
+        key = (self.x_scale.value(), self.y_scale.value(), self.z_scale.value())
+        if self._grid is None or self._grid[0] != key:
+            # Heights take only 256 values: scale those once and gather into
+            # float32, rounding each exactly as a float64 pass would have
+            levels = ((255 - np.arange(256)) / 255.0 * key[2]).astype(np.float32)
+            Z = levels[self.Z]
+            ny, nx = Z.shape
+            X = (np.arange(nx) * key[0]).astype(np.float32)
+            Y = (np.arange(ny) * key[1]).astype(np.float32)
+            self._grid = (key, X, Y, Z)
+        return self._grid[1:]
+
     def generate_mesh(self):
         if self.Z is None:
             QMessageBox.warning(self, "Warning", "Load an image first.")
             return
         try:
             self.progress.setValue(10)
-            Z = (255 - self.Z) / 255.0 * self.z_scale.value()
-
-            ny, nx = Z.shape
-            X = np.arange(nx) * self.x_scale.value()
-            Y = np.arange(ny) * self.y_scale.value()
+            X, Y, Z = self._scaled_grid()
             X, Y = np.meshgrid(X, Y)
 
             self.progress.setValue(50)
@@ -164,29 +176,24 @@ class Pic23DApp(QMainWindow):
         if not path:
             return
         try:
-            Z = (255 - self.Z) / 255.0 * self.z_scale.value()
-
+            X, Y, Z = self._scaled_grid()
             ny, nx = Z.shape
-            X = np.arange(nx) * self.x_scale.value()
-            Y = np.arange(ny) * self.y_scale.value()
-
-            verts, faces = [], []
-            for i in range(ny - 1):
-                for j in range(nx - 1):
-                    v1 = [X[j], Y[i], Z[i, j]]
-                    v2 = [X[j + 1], Y[i], Z[i, j + 1]]
-                    v3 = [X[j], Y[i + 1], Z[i + 1, j]]
-                    v4 = [X[j + 1], Y[i + 1], Z[i + 1, j + 1]]
-                    idx = len(verts)
-                    verts += [v1, v2, v3, v4]
-                    faces += [[idx, idx + 1, idx + 2], [idx + 1, idx + 3, idx + 2]]
-
-            verts = np.array(verts)
-            faces = np.array(faces)
-            mesh_obj = mesh.Mesh(np.zeros(faces.shape[0], dtype=mesh.Mesh.dtype))
-            for i, f in enumerate(faces):
-                for j in range(3):
-                    mesh_obj.vectors[i][j] = verts[f[j], :]
+
+            # One shared float32 vertex per pixel; every cell's two triangles come
+            # from four shifted views of it: (p00, p10, p01) and (p10, p11, p01)
+            P = np.empty((ny, nx, 3), dtype=np.float32)
+            P[:, :, 0] = X
+            P[:, :, 1] = Y[:, None]
+            P[:, :, 2] = Z
+            p00, p10 = P[:-1, :-1], P[:-1, 1:]
+            p01, p11 = P[1:, :-1], P[1:, 1:]
+
+            # Copy each corner slot straight into the mesh's float32 buffer,
+            # viewed as (row, col, triangle, corner, xyz): no triangle temporary
+            mesh_obj = mesh.Mesh(np.zeros(2 * (ny - 1) * (nx - 1), dtype=mesh.Mesh.dtype))
+            V = mesh_obj.vectors.reshape(ny - 1, nx - 1, 2, 3, 3)
+            V[:, :, 0, 0], V[:, :, 0, 1], V[:, :, 0, 2] = p00, p10, p01
+            V[:, :, 1, 0], V[:, :, 1, 1], V[:, :, 1, 2] = p10, p11, p01
             mesh_obj.save(path)
             self.statusBar().showMessage(f"STL saved: {path}")
             QMessageBox.information(self, "Export Complete", f"Saved: {os.path.basename(path)}")
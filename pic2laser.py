@@ -14,11 +14,13 @@ from PyQt6.QtWidgets import (
     QLabel, QPushButton, QFileDialog, QSlider, QProgressBar, QSplitter,
     QDoubleSpinBox, QMessageBox, QCheckBox
 )
-from PIL import Image, ImageOps
+from PIL import Image
 import numpy as np
 
 from themes.theme_utils import apply_theme
 
+PREVIEW_MAX = (1600, 1200)   # largest slider-preview image (w, h); export uses full res
+
 
 # ---------- Main Window ----------
 class Pic2LaserApp(QMainWindow):
@@ -29,6 +31,10 @@ class Pic2LaserApp(QMainWindow):
         self.resize(1200, 800)
         self.image = None
         self.processed = None
+        self._lut = None
+        self._lut_key = None
+        self._processed_key = None
+        self._preview_small = None
         self.init_ui()
 
     def init_ui(self):
@@ -92,11 +98,15 @@ class Pic2LaserApp(QMainWindow):
         splitter.addWidget(right)
         splitter.setSizes([280, 920])
 
-        # Connections for real-time update
-        self.brightness_slider.valueChanged.connect(self.preview_update)
-        self.contrast_slider.valueChanged.connect(self.preview_update)
-        self.gamma_slider.valueChanged.connect(self.preview_update)
-        self.invert_btn.stateChanged.connect(self.preview_update)
+        # Connections for real-time update: a drag refreshes once it pauses
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(30)
+        self._preview_timer.timeout.connect(self.preview_update)
+        self.brightness_slider.valueChanged.connect(lambda _: self._preview_timer.start())
+        self.contrast_slider.valueChanged.connect(lambda _: self._preview_timer.start())
+        self.gamma_slider.valueChanged.connect(lambda _: self._preview_timer.start())
+        self.invert_btn.stateChanged.connect(lambda _: self._preview_timer.start())
 
         self.statusBar().showMessage("Ready")
 
@@ -109,6 +119,10 @@ class Pic2LaserApp(QMainWindow):
             return
         self.image = Image.open(path).convert("L")
         self.processed = None
+        # Slider previews tonemap this display-sized copy instead of the full
+        # image; capped rather than fitted to the label, which can grow later
+        self._preview_small = self.image.copy()
+        self._preview_small.thumbnail(PREVIEW_MAX, Image.LANCZOS)
         self.update_preview(self.image)
         self.statusBar().showMessage(f"Loaded: {os.path.basename(path)}")
 
@@ -123,34 +137,46 @@ class Pic2LaserApp(QMainWindow):
             return
 
         self.progress.setValue(10)
-        QTimer.singleShot(50, lambda: self._do_process(update_only))
+        self._do_process(update_only)
 
     def _do_process(self, update_only):
-        img = self.image.copy()
-
-        # Brightness & Contrast
-        brightness = self.brightness_slider.value()
-        contrast = self.contrast_slider.value()
-        gamma = self.gamma_slider.value() / 100.0
-
-        np_img = np.array(img).astype(np.float32)
-        np_img = np_img * (1 + contrast / 100.0) + brightness
-        np_img = np.clip(np_img, 0, 255)
-        np_img = (np_img / 255.0) ** (1.0 / gamma) * 255.0
-        np_img = np.clip(np_img, 0, 255).astype(np.uint8)
-
-        img = Image.fromarray(np_img)
-
-        if self.invert_btn.isChecked():
-            img = ImageOps.invert(img)
-
-        self.processed = img
-        self.update_preview(img)
+        # An "L" image maps through a 256-entry table in one C pass; slider
+        # drags only redraw the label, so they map the display-sized copy
+        if update_only:
+            self.update_preview(self._preview_small.point(self._tone_lut()))
+        else:
+            self.update_preview(self._full_res())
         self.progress.setValue(100)
 
         if not update_only:
             self.statusBar().showMessage("Laser preview updated.")
 
+    def _full_res(self):
+        """Full-resolution output for the current settings, reused until they change."""
+        lut = self._tone_lut()
+        if self.processed is None or self._processed_key != self._lut_key:
+            self.processed = self.image.point(lut)
+            self._processed_key = self._lut_key
+        return self.processed
+
+    def _tone_lut(self):
+        """256-entry tone table for Image.point(); rebuilt only when the settings change."""
+        brightness = self.brightness_slider.value()
+        contrast = self.contrast_slider.value()
+        gamma = self.gamma_slider.value() / 100.0
+        invert = self.invert_btn.isChecked()
+        key = (brightness, contrast, gamma, invert)
+        if key != self._lut_key:
+            # Same float32 math as per pixel, but over the 256 possible inputs;
+            # clipping first keeps the gamma curve inside 0..255
+            lut = np.arange(256, dtype=np.float32) * (1 + contrast / 100.0) + brightness
+            np.clip(lut, 0, 255, out=lut)
+            lut = ((lut / 255.0) ** (1.0 / gamma) * 255.0).astype(np.uint8)
+            if invert:
+                lut = 255 - lut
+            self._lut, self._lut_key = lut.tolist(), key
+        return self._lut
+
     def update_preview(self, pil_image):
         if pil_image is None:
             return
@@ -170,8 +196,8 @@ class Pic2LaserApp(QMainWindow):
 
     # ---------- G-code Export ----------
     def export_gcode(self):
-        if self.processed is None:
-            QMessageBox.warning(self, "No Processed Image", "Generate laser preview first.")
+        if self.image is None:
+            QMessageBox.warning(self, "No Image", "Load an image first.")
             return
 
         path, _ = QFileDialog.getSaveFileName(
@@ -186,32 +212,35 @@ class Pic2LaserApp(QMainWindow):
         laser_min = 0
         laser_max = 255
 
-        arr = np.array(self.processed)
+        arr = np.asarray(self._full_res())
         h, w = arr.shape
-        gcode = [
-            "(Pic2Laser G-code)",
-            "G21 ; metric units",
-            "G90 ; absolute positioning",
-            "M4 S0",
-        ]
-
-        for y in range(h):
-            if y % 2 == 0:
-                x_range = range(w)
-            else:
-                x_range = range(w - 1, -1, -1)
-            gcode.append(f"G0 Y{y / h * height_mm:.3f}")
-            for x in x_range:
-                intensity = arr[y, x] / 255.0
-                power = int(laser_min + (1 - intensity) * (laser_max - laser_min))
-                gcode.append(f"G1 X{x / w * width_mm:.3f} S{power} F{feedrate:.1f}")
-            gcode.append("M5")
-        gcode.append("G0 X0 Y0")
-        gcode.append("M2")
+        # Power per gray level, gathered per pixel: no float copy of the image
+        levels = np.arange(256) / 255.0
+        powers = (laser_min + (1 - levels) * (laser_max - laser_min)).astype(np.int64)[arr]
+
+        # Every row visits the same X words, so format them once per column in
+        # both travel directions (the raster is serpentine)
+        cut = [f"G1 X{x:.3f} S%d F{feedrate:.1f}\n" for x in (np.arange(w) / w * width_mm).tolist()]
+        cut_rev = cut[::-1]
 
         try:
             with open(path, "w") as f:
-                f.write("\n".join(gcode))
+                f.write("(Pic2Laser G-code)\n"
+                        "G21 ; metric units\n"
+                        "G90 ; absolute positioning\n"
+                        "M4 S0\n")
+                for y in range(h):
+                    f.write(f"G0 Y{y / h * height_mm:.3f}\n")
+                    if y % 2 == 0:
+                        row, cols = powers[y], cut
+                    else:
+                        row, cols = powers[y, ::-1], cut_rev
+                    # Each G1 burns up to its X at its power, so a run of equal
+                    # powers collapses into one move to the run's last pixel
+                    ends = np.append(np.flatnonzero(np.diff(row)), w - 1)
+                    f.write("".join([cols[i] for i in ends.tolist()]) % tuple(row[ends].tolist()))
+                    f.write("M5\n")
+                f.write("G0 X0 Y0\nM2")
             QMessageBox.information(self, "Export Complete", f"G-code saved to:\n{path}")
             self.statusBar().showMessage("G-code export complete.")
         except Exception as e:
@@ -138,6 +138,13 @@ class STL3DViewer(QMainWindow):
         self.loader.error_occurred.connect(lambda e: QMessageBox.critical(self, "Error", e))
         self.loader.start()
 
+    def closeEvent(self, event):
+        # The window may be deleted on close (launcher); its thread must not outlive it
+        loader = getattr(self, "loader", None)
+        if loader is not None:
+            loader.wait()
+        super().closeEvent(event)
+
     def on_file_loaded(self, vertices, faces, normals):
         self.vertices, self.faces, self.normals = vertices, faces, normals
         self.statusBar().showMessage(f"Loaded: {os.path.basename(self.current_file)}")